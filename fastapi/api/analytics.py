@@ -0,0 +1,299 @@
+from datetime import date
+
+import numpy as np
+from sqlalchemy import String, select, type_coerce, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from api.models import Car, Rental, RentalArchive, RentalStatusEnum, RentalSummary
+
+# ---------------------------
+#   FLEET ANALYTICS (NumPy)
+# ---------------------------
+#
+# Les colonnes sont chargées en bloc dans des tableaux, sans objets ORM ;
+# les dates restent des chaînes SQLite converties en datetime64[D].
+
+REVENUE_STATUSES = (RentalStatusEnum.confirmed, RentalStatusEnum.finished)
+
+
+class Facts:
+    """Column arrays of revenue facts: one row per rental or summary row."""
+
+    def __init__(self, car_ids, months, counts, days, revenue):
+        self.car_ids = car_ids
+        self.months = months
+        self.counts = counts
+        self.days = days
+        self.revenue = revenue
+
+    @classmethod
+    def concat(cls, *parts):
+        return cls(*(np.concatenate(arrays) for arrays in zip(
+            *((p.car_ids, p.months, p.counts, p.days, p.revenue) for p in parts)
+        )))
+
+
+def _dates(values):
+    # None devient NaT
+    return np.array(values, dtype="datetime64[D]")
+
+
+def _floats(values):
+    return np.array(values, dtype=np.float64)
+
+
+def rental_days(starts, ends):
+    """Length in days; 0 for open-ended rentals."""
+    days = (ends - starts).astype(np.int64)
+    return np.where(np.isnat(ends), 0, days)
+
+
+def load_rental_columns(db, *criteria, model=Rental):
+    rows = db.execute(
+        select(
+            model.car_id,
+            type_coerce(model.start_date, String),
+            type_coerce(model.end_date, String),
+            model.total_price,
+        )
+        .where(model.car_id.isnot(None), *criteria)
+    ).all()
+
+    if not rows:
+        empty = np.array([], dtype="datetime64[D]")
+        return np.array([], dtype=np.int64), empty, empty, np.array([], dtype=np.float64)
+
+    car_ids, starts, ends, prices = zip(*rows)
+    return np.array(car_ids, dtype=np.int64), _dates(starts), _dates(ends), _floats(prices)
+
+
+def scanned_facts(db) -> Facts:
+    """Revenue rentals not yet folded into the summary table."""
+    car_ids, starts, ends, prices = load_rental_columns(
+        db,
+        Rental.status.in_(REVENUE_STATUSES),
+        Rental.summarized.is_(False),
+    )
+    return Facts(
+        car_ids,
+        starts.astype("datetime64[M]"),
+        np.ones(len(car_ids), dtype=np.int64),
+        rental_days(starts, ends),
+        np.nan_to_num(prices),
+    )
+
+
+def summary_facts(db) -> Facts:
+    rows = db.execute(
+        select(
+            RentalSummary.car_id,
+            RentalSummary.month,
+            RentalSummary.rentals,
+            RentalSummary.rental_days,
+            RentalSummary.revenue,
+        )
+    ).all()
+
+    if not rows:
+        return Facts(
+            np.array([], dtype=np.int64),
+            np.array([], dtype="datetime64[M]"),
+            np.array([], dtype=np.int64),
+            np.array([], dtype=np.int64),
+            np.array([], dtype=np.float64),
+        )
+
+    car_ids, months, counts, days, revenue = zip(*rows)
+    return Facts(
+        np.array(car_ids, dtype=np.int64),
+        np.array(months, dtype="datetime64[M]"),
+        np.array(counts, dtype=np.int64),
+        np.array(days, dtype=np.int64),
+        _floats(revenue),
+    )
+
+
+def car_brands(db, car_ids):
+    """Brand of each car id, as an array aligned with ``car_ids``."""
+    brands = dict(db.execute(select(Car.id, Car.brand)).all())
+    # Une recherche par voiture distincte, pas par ligne
+    unique, inverse = np.unique(car_ids, return_inverse=True)
+    mapped = np.array([brands.get(int(c), "unknown") for c in unique], dtype=object)
+    return mapped[inverse]
+
+
+def group_facts(keys, facts: Facts) -> list:
+    if len(keys) == 0:
+        return []
+
+    unique, inverse = np.unique(keys, return_inverse=True)
+    revenue = np.bincount(inverse, weights=facts.revenue, minlength=len(unique))
+    counts = np.bincount(inverse, weights=facts.counts, minlength=len(unique))
+    days = np.bincount(inverse, weights=facts.days, minlength=len(unique))
+
+    return [
+        {
+            "key": key.item() if hasattr(key, "item") else key,
+            "revenue": round(float(r), 2),
+            "rentals": int(c),
+            "rental_days": int(d),
+            "average_rental_days": round(float(d / c), 2) if c else 0.0,
+        }
+        for key, r, c, d in zip(unique, revenue, counts, days)
+    ]
+
+
+def revenue_report(db, group_by: str) -> list:
+    facts = Facts.concat(summary_facts(db), scanned_facts(db))
+
+    if group_by == "car":
+        keys = facts.car_ids
+    elif group_by == "brand":
+        keys = car_brands(db, facts.car_ids)
+    else:
+        keys = facts.months.astype(str)
+
+    return group_facts(keys, facts)
+
+
+def utilization_report(db, start: date, end: date) -> dict:
+    """Share of [start, end) each car spent booked, from overlapping rentals
+    (archived ones included)."""
+    window_start = np.datetime64(start, "D")
+    window_end = np.datetime64(end, "D")
+    window_days = int((window_end - window_start).astype(np.int64))
+
+    parts = [
+        load_rental_columns(
+            db,
+            model.status.in_(REVENUE_STATUSES),
+            model.start_date < end,
+            (model.end_date.is_(None)) | (model.end_date > start),
+            model=model,
+        )
+        for model in (Rental, RentalArchive)
+    ]
+    car_ids, starts, ends, _ = (np.concatenate(arrays) for arrays in zip(*parts))
+
+    # Chevauchement de chaque location avec la fenêtre
+    clipped_end = np.where(np.isnat(ends), window_end, np.minimum(ends, window_end))
+    clipped_start = np.maximum(starts, window_start)
+    booked = np.clip((clipped_end - clipped_start).astype(np.int64), 0, None)
+
+    fleet = np.array(db.scalars(select(Car.id)).all(), dtype=np.int64)
+    fleet.sort()
+    per_car = np.zeros(len(fleet), dtype=np.int64)
+    if len(car_ids) and len(fleet):
+        pos = np.searchsorted(fleet, car_ids)
+        valid = (pos < len(fleet)) & (fleet[np.minimum(pos, len(fleet) - 1)] == car_ids)
+        np.add.at(per_car, pos[valid], booked[valid])
+
+    # Plusieurs locations peuvent se chevaucher : plafonné à 100 %
+    utilization = np.minimum(per_car / window_days, 1.0) if window_days else per_car * 0.0
+
+    lengths = rental_days(starts, ends)
+    closed = ~np.isnat(ends)
+
+    return {
+        "start_date": start,
+        "end_date": end,
+        "window_days": window_days,
+        "cars": len(fleet),
+        "rentals": len(car_ids),
+        "fleet_utilization_pct": round(float(utilization.mean() * 100), 2) if len(fleet) else 0.0,
+        "average_rental_days": round(float(lengths[closed].mean()), 2) if closed.any() else 0.0,
+        "per_car": [
+            {"car_id": int(c), "booked_days": int(d), "utilization_pct": round(float(u * 100), 2)}
+            for c, d, u in zip(fleet, per_car, utilization)
+        ],
+    }
+
+
+# -------- SUMMARY TABLE --------
+
+def refresh_summary(db, batch_size: int = 5000) -> int:
+    """Fold finished, not yet summarized rentals into rental_summaries.
+
+    Runs in bounded batches, each batch claimed, upserted and committed in
+    one transaction, so the job can stop and resume at any point. The
+    claim (UPDATE ... WHERE summarized = 0 RETURNING) takes the write lock
+    first: an overlapping run (admin route vs archive job) waits, then
+    only sees the rows left, so no rental is folded twice.
+    """
+    pending = (
+        Rental.status == RentalStatusEnum.finished,
+        Rental.summarized.is_(False),
+        Rental.car_id.isnot(None),
+    )
+    # Lecture en cours sur la session (vérification de l'admin...) : close
+    # avant la réclamation, sinon SQLite peut refuser l'écriture (BUSY_SNAPSHOT)
+    db.commit()
+
+    folded = 0
+    while True:
+        batch = select(Rental.id).where(*pending).order_by(Rental.id).limit(batch_size)
+        rows = db.execute(
+            update(Rental)
+            .where(Rental.id.in_(batch.scalar_subquery()), *pending)
+            .values(summarized=True)
+            .returning(
+                Rental.id,
+                Rental.car_id,
+                type_coerce(Rental.start_date, String),
+                type_coerce(Rental.end_date, String),
+                Rental.total_price,
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        if not rows:
+            db.rollback()
+            break
+
+        ids, car_ids, starts, ends, prices = zip(*rows)
+        starts, ends = _dates(starts), _dates(ends)
+        facts = Facts(
+            np.array(car_ids, dtype=np.int64),
+            starts.astype("datetime64[M]"),
+            np.ones(len(ids), dtype=np.int64),
+            rental_days(starts, ends),
+            np.nan_to_num(_floats(prices)),
+        )
+
+        # Regroupement (car_id, mois) avant l'upsert
+        keys = np.rec.fromarrays([facts.car_ids, facts.months.astype(np.int64)])
+        unique, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse, weights=facts.counts, minlength=len(unique))
+        days = np.bincount(inverse, weights=facts.days, minlength=len(unique))
+        revenue = np.bincount(inverse, weights=facts.revenue, minlength=len(unique))
+
+        values = [
+            {
+                "car_id": int(car_id),
+                "month": str(np.datetime64(int(month), "M")),
+                "rentals": int(c),
+                "rental_days": int(d),
+                "revenue": float(r),
+            }
+            for (car_id, month), c, d, r in zip(unique.tolist(), counts, days, revenue)
+        ]
+
+        stmt = sqlite_insert(RentalSummary)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[RentalSummary.car_id, RentalSummary.month],
+                set_={
+                    "rentals": RentalSummary.rentals + stmt.excluded.rentals,
+                    "rental_days": RentalSummary.rental_days + stmt.excluded.rental_days,
+                    "revenue": RentalSummary.revenue + stmt.excluded.revenue,
+                },
+            ),
+            values,
+        )
+        db.commit()
+        folded += len(ids)
+
+        if len(ids) < batch_size:
+            break
+
+    return folded
@@ -0,0 +1,189 @@
+from datetime import date, timedelta
+import json
+
+from sqlalchemy import delete, func, insert, literal, or_, select, union_all
+
+from api.models import Rental, RentalArchive, RentalStatusEnum
+from api.settings import get_settings
+
+# ---------------------------
+#   RENTAL ARCHIVE
+# ---------------------------
+#
+# Les locations closes (terminées et déjà agrégées dans rental_summaries,
+# ou annulées) plus anciennes que la rétention passent dans
+# rentals_archive par lots : la table chaude et ses index ne gardent que
+# l'actif et l'historique récent. Rétention, lots et pages libérées :
+# Settings (archive_*).
+
+ARCHIVED_COLUMNS = (
+    "id",
+    "car_id",
+    "renter_id",
+    "admin_id",
+    "start_date",
+    "end_date",
+    "price_per_day",
+    "total_price",
+    "status",
+    "summarized",
+)
+
+
+def archivable(today: date, retention_days: int):
+    cutoff = today - timedelta(days=retention_days)
+    return (
+        or_(
+            # Le revenu des locations terminées vit déjà dans le résumé
+            (Rental.status == RentalStatusEnum.finished) & Rental.summarized.is_(True),
+            Rental.status == RentalStatusEnum.cancelled,
+        ),
+        func.coalesce(Rental.end_date, Rental.start_date) < cutoff,
+        # SQLite réutilise max(id) + 1 : on garde toujours la dernière ligne
+        Rental.id < select(func.max(Rental.id)).scalar_subquery(),
+    )
+
+
+def archive_rentals(
+    db,
+    today: date,
+    batch_size: int | None = None,
+    retention_days: int | None = None,
+) -> int:
+    """Move closed rentals past the retention window; one transaction per batch.
+
+    Finished rentals are folded into the summary first, so revenue reports
+    are unchanged by archiving. Unset arguments come from the settings.
+    """
+    settings = get_settings()
+    batch_size = batch_size or settings.archive_batch_size
+    if retention_days is None:
+        retention_days = settings.archive_retention_days
+
+    # numpy n'est chargé qu'au premier passage
+    from api import analytics
+
+    analytics.refresh_summary(db, batch_size)
+
+    criteria = archivable(today, retention_days)
+    moved = 0
+    while True:
+        ids = db.scalars(
+            select(Rental.id).where(*criteria).order_by(Rental.id).limit(batch_size)
+        ).all()
+        if not ids:
+            break
+
+        db.execute(
+            insert(RentalArchive).from_select(
+                ARCHIVED_COLUMNS,
+                select(*(getattr(Rental, name) for name in ARCHIVED_COLUMNS)).where(Rental.id.in_(ids)),
+            )
+        )
+        db.execute(
+            delete(Rental).where(Rental.id.in_(ids)).execution_options(synchronize_session=False)
+        )
+        db.commit()
+        moved += len(ids)
+
+        if len(ids) < batch_size:
+            break
+    return moved
+
+
+# -------- COMPACTION --------
+
+def auto_vacuum_mode(conn) -> int:
+    """0 = none, 1 = full, 2 = incremental (PRAGMA auto_vacuum)."""
+    return conn.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+
+
+def compact(engine, mode: str, pages: int | None = None) -> dict:
+    """Return free pages to the filesystem.
+
+    ``incremental`` frees up to ``pages`` pages and needs auto_vacuum =
+    INCREMENTAL (set on new databases); ``full`` rewrites the whole file,
+    blocking writers meanwhile, and switches the file to the configured
+    auto_vacuum mode.
+    """
+    if engine.url.get_backend_name() != "sqlite":
+        return {"mode": mode, "skipped": "not sqlite"}
+    pages = pages or get_settings().archive_vacuum_pages
+
+    # Hors transaction : VACUUM l'exige
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        before = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+        if mode == "full":
+            conn.exec_driver_sql("VACUUM")
+        elif auto_vacuum_mode(conn) == 2:
+            # Une page libérée par step : execute() du module sqlite3 n'en
+            # fait qu'un, executescript() va jusqu'au bout
+            conn.connection.driver_connection.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+        else:
+            return {"mode": mode, "skipped": "auto_vacuum is not INCREMENTAL", "free_pages": before}
+        after = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+
+    return {"mode": mode, "freed_pages": before - after, "free_pages": after}
+
+
+# -------- UNIFIED HISTORY --------
+
+HISTORY_COLUMNS = (
+    "id",
+    "car_id",
+    "renter_id",
+    "start_date",
+    "end_date",
+    "price_per_day",
+    "total_price",
+    "status",
+)
+
+
+def history_statement(
+    car_id: int | None = None,
+    renter_id: int | None = None,
+    include_archive: bool = True,
+):
+    """Rentals from the hot table, and the archive when asked, as one
+    UNION ALL with an ``archived`` flag; newest first."""
+    def part(model, archived: bool):
+        query = select(
+            *(getattr(model, name) for name in HISTORY_COLUMNS),
+            literal(archived).label("archived"),
+        )
+        if car_id is not None:
+            query = query.where(model.car_id == car_id)
+        if renter_id is not None:
+            query = query.where(model.renter_id == renter_id)
+        return query
+
+    if not include_archive:
+        hot = part(Rental, False).subquery()
+    else:
+        hot = union_all(part(Rental, False), part(RentalArchive, True)).subquery()
+
+    return select(hot).order_by(hot.c.start_date.desc(), hot.c.id.desc())
+
+
+if __name__ == "__main__":
+    # python -m api.archive --vacuum full : le VACUUM complet bloque les
+    # écritures pendant toute la réécriture, il n'est pas exposé par l'API
+    import argparse
+
+    from api.database import SessionLocal, engine
+
+    parser = argparse.ArgumentParser(description="Archive closed rentals, then optionally compact the database.")
+    parser.add_argument("--retention-days", type=int, help="default: ARCHIVE_RETENTION_DAYS")
+    parser.add_argument("--batch-size", type=int, help="default: ARCHIVE_BATCH_SIZE")
+    parser.add_argument("--vacuum", choices=("none", "incremental", "full"), default="none")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = {"archived": archive_rentals(db, date.today(), args.batch_size, args.retention_days)}
+    finally:
+        db.close()
+    if args.vacuum != "none":
+        result["vacuum"] = compact(engine, args.vacuum)
+    print(json.dumps(result))
@@ -0,0 +1,179 @@
+from bisect import bisect_left, bisect_right
+from datetime import date
+import threading
+
+from api.models import Rental, RentalStatusEnum
+
+# ---------------------------
+#   RENTAL AVAILABILITY INDEX
+# ---------------------------
+#
+# Une location occupe la voiture sur [start_date, end_date) : la voiture
+# rendue le jour J peut repartir le jour J. Une location sans end_date
+# bloque la voiture indéfiniment.
+#
+# Index en mémoire, par processus : chaque worker ne voit que les écritures
+# qui passent par lui. Il ne sert qu'à filtrer /rentals/availability ; la
+# réservation elle-même est toujours vérifiée en base (try_book).
+
+# Statuts qui bloquent une voiture
+BLOCKING_STATUSES = (RentalStatusEnum.pending, RentalStatusEnum.confirmed)
+
+OPEN_END = date.max
+
+
+class CarIntervals:
+    """Sorted intervals of one car, with a running max of end dates.
+
+    ``max_ends[i]`` is the latest end among the first ``i + 1`` intervals
+    (ordered by start), so "does anything overlap [a, b)" is one bisect on
+    the starts plus one lookup.
+    """
+
+    __slots__ = ("starts", "ends", "ids", "max_ends")
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.ids = []
+        self.max_ends = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _rebuild_max_from(self, pos: int):
+        running = self.max_ends[pos - 1] if pos > 0 else date.min
+        for i in range(pos, len(self.ends)):
+            if self.ends[i] > running:
+                running = self.ends[i]
+            self.max_ends[i] = running
+
+    def add(self, rental_id: int, start: date, end: date):
+        pos = bisect_right(self.starts, start)
+        self.starts.insert(pos, start)
+        self.ends.insert(pos, end)
+        self.ids.insert(pos, rental_id)
+        self.max_ends.insert(pos, end)
+        self._rebuild_max_from(pos)
+
+    def remove(self, rental_id: int, start: date) -> bool:
+        lo = bisect_left(self.starts, start)
+        hi = bisect_right(self.starts, start)
+        for pos in range(lo, hi):
+            if self.ids[pos] == rental_id:
+                del self.starts[pos]
+                del self.ends[pos]
+                del self.ids[pos]
+                del self.max_ends[pos]
+                self._rebuild_max_from(pos)
+                return True
+        return False
+
+    def overlaps(self, start: date, end: date) -> bool:
+        # Intervalles qui commencent avant la fin de la fenêtre
+        count = bisect_left(self.starts, end)
+        return count > 0 and self.max_ends[count - 1] > start
+
+    def conflicts(self, start: date, end: date) -> list:
+        count = bisect_left(self.starts, end)
+        return [self.ids[i] for i in range(count) if self.ends[i] > start]
+
+
+class AvailabilityIndex:
+    """In-memory per-car interval index over blocking rentals.
+
+    Built lazily from the database on first use, then kept up to date by
+    the rental write paths through ``add_rental`` / ``remove_rental``.
+    """
+
+    def __init__(self):
+        self._cars = {}
+        self._rentals = {}
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def clear(self):
+        with self._lock:
+            self._cars.clear()
+            self._rentals.clear()
+            self.loaded = False
+
+    def load(self, db):
+        with self._lock:
+            self._load(db)
+
+    def ensure_loaded(self, db):
+        if self.loaded:
+            return
+        with self._lock:
+            if not self.loaded:
+                self._load(db)
+
+    def _load(self, db):
+        # Verrou tenu pendant la requête : une écriture qui arrive pendant le
+        # chargement attend, puis s'applique ; une écriture antérieure est
+        # déjà dans le résultat
+        rows = (
+            db.query(Rental.id, Rental.car_id, Rental.start_date, Rental.end_date)
+            .filter(Rental.status.in_(BLOCKING_STATUSES))
+            .filter(Rental.car_id.isnot(None))
+            .all()
+        )
+        self._cars.clear()
+        self._rentals.clear()
+        for rental_id, car_id, start, end in rows:
+            self._add(rental_id, car_id, start, end)
+        self.loaded = True
+
+    def _add(self, rental_id, car_id, start, end):
+        end = end or OPEN_END
+        intervals = self._cars.get(car_id)
+        if intervals is None:
+            intervals = self._cars[car_id] = CarIntervals()
+        intervals.add(rental_id, start, end)
+        self._rentals[rental_id] = (car_id, start)
+
+    def _remove(self, rental_id):
+        entry = self._rentals.pop(rental_id, None)
+        if entry is None:
+            return
+        car_id, start = entry
+        intervals = self._cars[car_id]
+        intervals.remove(rental_id, start)
+        if not intervals:
+            del self._cars[car_id]
+
+    def add_rental(self, rental: Rental):
+        """Index a rental, or drop it if its status no longer blocks the car."""
+        with self._lock:
+            if not self.loaded:
+                return
+            self._remove(rental.id)
+            if rental.status in BLOCKING_STATUSES and rental.car_id is not None:
+                self._add(rental.id, rental.car_id, rental.start_date, rental.end_date)
+
+    def remove_rental(self, rental_id: int):
+        with self._lock:
+            if self.loaded:
+                self._remove(rental_id)
+
+    def is_free(self, car_id: int, start: date, end: date) -> bool:
+        with self._lock:
+            intervals = self._cars.get(car_id)
+            return intervals is None or not intervals.overlaps(start, end)
+
+    def conflicts(self, car_id: int, start: date, end: date) -> list:
+        with self._lock:
+            intervals = self._cars.get(car_id)
+            return [] if intervals is None else intervals.conflicts(start, end)
+
+    def busy_cars(self, start: date, end: date) -> set:
+        with self._lock:
+            return {
+                car_id
+                for car_id, intervals in self._cars.items()
+                if intervals.overlaps(start, end)
+            }
+
+
+availability_index = AvailabilityIndex()
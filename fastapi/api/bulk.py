@@ -0,0 +1,203 @@
+import codecs
+import csv
+import io
+import json
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from api.database import SessionLocal
+from api.models import Car
+from api.response_cache import cars_cache
+
+# ---------------------------
+#   BULK CAR IMPORT / EXPORT
+# ---------------------------
+
+BATCH_SIZE = 1000
+
+# Au-delà, les erreurs sont seulement comptées
+MAX_REPORTED_ERRORS = 1000
+
+EXPORT_COLUMNS = (
+    "id",
+    "plate_number",
+    "brand",
+    "model",
+    "mileage",
+    "status",
+    "rental_price_per_day",
+)
+
+
+# -------- PARSING --------
+
+async def iter_lines(chunks):
+    """Decode a byte stream into lines, keeping the line endings."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        # La dernière ligne peut être incomplète
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_ndjson_rows(lines):
+    number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            yield number, json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield number, None, f"Invalid JSON: {e.msg}"
+
+
+async def iter_csv_rows(lines):
+    header = None
+    buffered = []
+    quotes = 0
+    number = 0
+    async for line in lines:
+        buffered.append(line)
+        quotes += line.count('"')
+        # Nombre impair de guillemets : champ sur plusieurs lignes
+        if quotes % 2:
+            continue
+        record = next(csv.reader(buffered), [])
+        buffered = []
+        quotes = 0
+
+        if not any(field.strip() for field in record):
+            continue
+        if header is None:
+            header = [field.strip() for field in record]
+            continue
+
+        number += 1
+        if len(record) != len(header):
+            yield number, None, f"Expected {len(header)} fields, got {len(record)}"
+            continue
+        # Champ vide = valeur absente (défaut du schéma)
+        yield number, {k: v for k, v in zip(header, record) if v != ""}, None
+
+    if buffered:
+        yield number + 1, None, "Unterminated quoted field"
+
+
+# -------- INSERT --------
+
+class BulkImportReport:
+
+    def __init__(self):
+        self.inserted = 0
+        self.failed = 0
+        self.errors = []
+
+    def error(self, row: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def as_dict(self) -> dict:
+        return {
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": sorted(self.errors, key=lambda e: e["row"]),
+        }
+
+
+def validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+def insert_batch(db, batch, report: BulkImportReport):
+    """Insert one batch of ``(row_number, values)`` in a single transaction.
+
+    Duplicate plates (inside the batch or already stored) are reported per
+    row and the rest of the batch is inserted with one executemany.
+    """
+    plates = [values["plate_number"] for _, values in batch]
+    existing = set(db.scalars(select(Car.plate_number).where(Car.plate_number.in_(plates))))
+
+    rows = []
+    for number, values in batch:
+        plate = values["plate_number"]
+        if plate in existing:
+            report.error(number, f"Duplicate plate_number '{plate}'")
+            continue
+        existing.add(plate)
+        rows.append((number, values))
+
+    if not rows:
+        return
+
+    try:
+        db.execute(insert(Car), [values for _, values in rows])
+        db.commit()
+        cars_cache.bump()
+        report.inserted += len(rows)
+    except IntegrityError:
+        # Insert concurrent : on retombe sur une ligne à la fois
+        db.rollback()
+        for number, values in rows:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(Car), values)
+                report.inserted += 1
+            except IntegrityError:
+                report.error(number, f"Duplicate plate_number '{values['plate_number']}'")
+        db.commit()
+        cars_cache.bump()
+
+
+# -------- EXPORT --------
+
+def export_rows(batch_size: int = BATCH_SIZE):
+    """Yield car tuples from a streamed cursor on a dedicated session."""
+    db = SessionLocal()
+    try:
+        columns = [getattr(Car, name) for name in EXPORT_COLUMNS]
+        result = db.execute(
+            select(*columns).order_by(Car.id).execution_options(yield_per=batch_size)
+        )
+        for partition in result.partitions():
+            yield partition
+    finally:
+        db.close()
+
+
+def export_csv(batch_size: int = BATCH_SIZE):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for partition in export_rows(batch_size):
+        for row in partition:
+            writer.writerow([
+                value.value if name == "status" else ("" if value is None else value)
+                for name, value in zip(EXPORT_COLUMNS, row)
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_ndjson(batch_size: int = BATCH_SIZE):
+    for partition in export_rows(batch_size):
+        lines = []
+        for row in partition:
+            record = dict(zip(EXPORT_COLUMNS, row))
+            record["status"] = record["status"].value
+            lines.append(json.dumps(record))
+        yield "\n".join(lines) + "\n"
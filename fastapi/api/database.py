@@ -1,22 +1,164 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from api.settings import Settings, get_settings
+
 # ---------------------------
 #   DATABASE CONFIGURATION
 # ---------------------------
+#
+# Rien n'est construit à l'import : configure() crée les engines (lifespan
+# de create_app). Hors application (scripts, benchmarks), le premier accès
+# à database.engine les crée depuis get_settings().
 
-SQL_ALCHEMY_DATABASE_URL = "sqlite:///./rental_car_app.db"
-
-engine = create_engine(
-    SQL_ALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
+Base = declarative_base()
 
+# Lié à l'engine par configure()
 SessionLocal = sessionmaker(
     autocommit=False,
-    autoflush=False,
-    bind=engine
+    autoflush=False
 )
 
-Base = declarative_base()
+_configured_with = None
+
+
+def sqlite_pragmas(settings: Settings):
+    """``connect`` listener applying the SQLite pragmas of ``settings``."""
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA auto_vacuum={settings.sqlite_auto_vacuum}")
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        cursor.close()
+
+    return set_sqlite_pragmas
+
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def is_memory_sqlite(url: str) -> bool:
+    """``sqlite://``, ``:memory:`` or ``mode=memory``: one database per
+    connection, so SQLAlchemy keeps a single-connection pool."""
+    parsed = make_url(url)
+    return is_sqlite(url) and (
+        parsed.database in (None, "", ":memory:")
+        or parsed.query.get("mode") == "memory"
+    )
+
+
+def uses_queue_pool(url: str) -> bool:
+    return not is_memory_sqlite(url)
+
+
+def engine_options(settings: Settings, url: str) -> dict:
+    options = {}
+    # SingletonThreadPool / StaticPool refusent ces arguments
+    if uses_queue_pool(url):
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    if is_sqlite(url):
+        options["connect_args"] = {"check_same_thread": False}
+    return options
+
+
+def configure(settings: Settings | None = None):
+    """Build the engine(s) for ``settings`` and bind the session factories.
+
+    Called again with equal settings, keeps the existing engines.
+    """
+    global _configured_with, engine, async_engine, AsyncSessionLocal
+    settings = settings or get_settings()
+    if settings == _configured_with:
+        return engine
+
+    if _configured_with is not None:
+        engine.dispose()
+
+    url = settings.database_url
+    engine = create_engine(url, **engine_options(settings, url))
+    if is_sqlite(url):
+        event.listen(engine, "connect", sqlite_pragmas(settings))
+    SessionLocal.configure(bind=engine)
+
+    async_engine = None
+    AsyncSessionLocal = None
+    if settings.db_mode == "async":
+        async_engine, AsyncSessionLocal = build_async(settings)
+
+    _configured_with = settings
+    return engine
+
+
+def __getattr__(name):
+    # Accès paresseux : engine, async_engine, AsyncSessionLocal
+    if name in ("engine", "async_engine", "AsyncSessionLocal"):
+        configure()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def warm_pool(engine, connections: int):
+    """Open ``connections`` pooled connections (pragmas, dialect setup)
+    and hand them back, so the first requests don't pay for it."""
+    opened = [engine.connect() for _ in range(connections)]
+    for conn in opened:
+        conn.close()
+
+
+async def warm_async_pool(async_engine, connections: int):
+    opened = [await async_engine.connect() for _ in range(connections)]
+    for conn in opened:
+        await conn.close()
+
+
+async def dispose():
+    """Close pooled connections; the engines stay usable."""
+    if _configured_with is None:
+        return
+    # Ferme les connexions aiosqlite (leurs threads bloquent la sortie)
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+
+
+# ---------------------------
+#   ASYNC ENGINE (DB_MODE=async)
+# ---------------------------
+
+def async_database_url(url: str) -> str:
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    return url
+
+
+def build_async(settings: Settings):
+    # aiosqlite n'est nécessaire qu'en mode async
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    url = async_database_url(settings.database_url)
+
+    options = engine_options(settings, url)
+    if uses_queue_pool(url):
+        # aiosqlite défaut à NullPool : on garde un pool dimensionné
+        options["poolclass"] = AsyncAdaptedQueuePool
+
+    async_engine = create_async_engine(url, **options)
+
+    if is_sqlite(url):
+        event.listen(async_engine.sync_engine, "connect", sqlite_pragmas(settings))
+
+    return async_engine, async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=False
+    )
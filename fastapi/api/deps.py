@@ -1,19 +1,22 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Annotated
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 from jose import jwt, JWTError
-from dotenv import load_dotenv
-import os
+import asyncio
+import hashlib
+import threading
+import time
 
 # Import propre
+from api import database
 from api.database import SessionLocal
-
-load_dotenv()
-
-SECRET_KEY = os.getenv("AUTH_SECRET_KEY")
-ALGORITHM = os.getenv("AUTH_ALGORITHM")
+from api.models import Admin
+from api.settings import Settings, get_settings
 
 # ============================
 #       DATABASE DEPENDENCY
@@ -29,11 +32,51 @@ def get_db():
 db_dependency = Annotated[Session, Depends(get_db)]
 
 
+async def get_async_db():
+    async with database.AsyncSessionLocal() as db:
+        yield db
+
+# Only usable with DB_MODE=async
+async_db_dependency = Annotated[AsyncSession, Depends(get_async_db)]
+
+
 # ============================
 #       SECURITY SETUP
 # ============================
 
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Changing auth_bcrypt_rounds marks older hashes for rehash on next login
+bcrypt_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=get_settings().auth_bcrypt_rounds,
+)
+
+
+def build_hash_executor(workers: int) -> ThreadPoolExecutor:
+    # bcrypt releases the GIL, so a small thread pool keeps hashing off the
+    # event loop and bounds how many cores a login burst can take.
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+
+
+hash_workers = get_settings().auth_hash_workers
+hash_executor = build_hash_executor(hash_workers)
+
+
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hash_executor, bcrypt_context.hash, password)
+
+
+async def verify_password(password: str, hashed_password: str):
+    """Return ``(valid, new_hash)``; ``new_hash`` is set when the stored
+    hash uses an outdated cost and should be replaced."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        hash_executor,
+        bcrypt_context.verify_and_update,
+        password,
+        hashed_password
+    )
 
 # Ce tokenUrl = '/auth/token' correspond à la route User
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
@@ -41,13 +84,96 @@ oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
 oauth2_bearer_dependency = Annotated[str, Depends(oauth2_bearer)]
 
 
+# ============================
+#     VERIFIED TOKEN CACHE
+# ============================
+
+class TokenCache:
+    """Bounded LRU of verified JWT claims, keyed by a SHA-256 of the token.
+
+    Entries expire at the token's ``exp`` so a cached token is never
+    accepted past its lifetime.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                user, expires_at = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return user
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, user: dict, expires_at: float):
+        if self.maxsize <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (user, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+token_cache = TokenCache(get_settings().auth_token_cache_size)
+
+
+def configure(settings: Settings):
+    """Apply ``settings`` to the hashing pool, bcrypt cost and token cache."""
+    global hash_executor, hash_workers
+    bcrypt_context.update(bcrypt__rounds=settings.auth_bcrypt_rounds)
+    token_cache.maxsize = settings.auth_token_cache_size
+
+    if settings.auth_hash_workers != hash_workers:
+        # Les hachages en cours finissent sur l'ancien pool
+        hash_executor.shutdown(wait=False)
+        hash_executor = build_hash_executor(settings.auth_hash_workers)
+        hash_workers = settings.auth_hash_workers
+
+
 # ============================
 #       JWT VALIDATION
 # ============================
 
 async def get_current_user(token: oauth2_bearer_dependency):
+    user = token_cache.get(token)
+    if user is not None:
+        return user
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        settings = get_settings()
+        payload = jwt.decode(token, settings.auth_secret_key, algorithms=[settings.auth_algorithm])
 
         username: str = payload.get("sub")
         user_id: int = payload.get("id")
@@ -58,7 +184,15 @@ async def get_current_user(token: oauth2_bearer_dependency):
                 detail="Could not validate user"
             )
 
-        return {"username": username, "id": user_id}
+        # Tokens antérieurs au claim "role" : traités comme renter
+        user = {"username": username, "id": user_id, "role": payload.get("role", "renter")}
+
+        # Sans exp, le token n'est pas mis en cache
+        expires_at = payload.get("exp")
+        if expires_at is not None:
+            token_cache.put(token, user, float(expires_at))
+
+        return user
 
     except JWTError:
         raise HTTPException(
@@ -68,3 +202,39 @@ async def get_current_user(token: oauth2_bearer_dependency):
 
 
 user_dependency = Annotated[dict, Depends(get_current_user)]
+
+
+# ============================
+#        ADMIN GUARD
+# ============================
+
+def get_current_admin(user: user_dependency, db: db_dependency):
+    """The caller, if the token was issued to an admin that still exists.
+
+    The ``role`` claim alone is not trusted: id and username must match
+    an Admin row, so deleting an admin revokes its tokens.
+    """
+    admin = db.get(Admin, user["id"]) if user["role"] == "admin" else None
+
+    if admin is None or admin.username != user["username"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+
+    return user
+
+
+admin_dependency = Annotated[dict, Depends(get_current_admin)]
+
+
+def renter_scope(user: dict, db) -> int | None:
+    """Renter id the caller's reads are limited to; None for an admin.
+
+    A token with the admin role is checked like ``get_current_admin``.
+    """
+    if user["role"] == "renter":
+        return user["id"]
+
+    get_current_admin(user, db)
+    return None
@@ -0,0 +1,168 @@
+import asyncio
+from collections import deque
+import json
+import threading
+
+from api.settings import Settings, get_settings
+
+# ---------------------------
+#   FLEET STATUS EVENTS (pub/sub)
+# ---------------------------
+#
+# Broker en mémoire, par processus : les routes d'écriture publient des
+# deltas compacts, les abonnés SSE les reçoivent sans repasser par la base.
+# Un abonné trop lent est vidé et reçoit un "resync" : il doit recharger
+# GET /cars puis reprendre le flux.
+
+RESYNC = "resync"
+
+
+class Subscription:
+    """Bounded event queue of one subscriber, bound to its event loop.
+
+    ``offer`` may be called from any thread (sync routes run in the
+    threadpool); the consumer is woken with ``call_soon_threadsafe``.
+    """
+
+    def __init__(self, loop, maxsize: int):
+        self.loop = loop
+        self.maxsize = maxsize
+        self.lagged = False
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._wakeup = asyncio.Event()
+
+    def offer(self, event) -> bool:
+        """Queue an event; returns False when it had to drop the queue."""
+        dropped = False
+        with self._lock:
+            if self.lagged:
+                # Déjà en retard : le resync couvrira cet événement
+                return True
+            if len(self._pending) >= self.maxsize:
+                self._pending.clear()
+                self.lagged = True
+                dropped = True
+            else:
+                self._pending.append(event)
+        try:
+            self.loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # Boucle fermée : l'abonné est en train de partir
+            pass
+        return not dropped
+
+    async def next_batch(self, timeout: float):
+        """Pending events, ``RESYNC`` after a drop, or ``None`` on timeout."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._wakeup.clear()
+        with self._lock:
+            if self.lagged:
+                self.lagged = False
+                return RESYNC
+            events = list(self._pending)
+            self._pending.clear()
+        return events
+
+
+class FleetBroker:
+
+    def __init__(self, queue_size: int, history: int):
+        self.queue_size = queue_size
+        self.seq = 0
+        self._history = deque(maxlen=history)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self.published = 0
+        self.resyncs = 0
+
+    def configure(self, queue_size: int, history: int):
+        """New sizes; existing subscribers keep their queue size."""
+        with self._lock:
+            self.queue_size = queue_size
+            if self._history.maxlen != history:
+                self._history = deque(self._history, maxlen=history)
+
+    def publish(self, type: str, data: dict):
+        """Fan an event out to every subscriber; safe from any thread."""
+        with self._lock:
+            self.seq += 1
+            event = (self.seq, type, json.dumps(data, separators=(",", ":"), default=str))
+            self._history.append(event)
+            self.published += 1
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            if not subscription.offer(event):
+                with self._lock:
+                    self.resyncs += 1
+
+    def subscribe(self, last_event_id: int | None = None):
+        """Register a subscriber; returns it with the events to replay first.
+
+        Replay is ``RESYNC`` when ``last_event_id`` fell out of the history.
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if last_event_id is None or last_event_id == self.seq:
+                return subscription, []
+            oldest = self._history[0][0] if self._history else self.seq + 1
+            if last_event_id > self.seq or last_event_id < oldest - 1:
+                self.resyncs += 1
+                return subscription, RESYNC
+            return subscription, [e for e in self._history if e[0] > last_event_id]
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "seq": self.seq,
+                "subscribers": len(self._subscribers),
+                "published": self.published,
+                "resyncs": self.resyncs,
+            }
+
+
+fleet_events = FleetBroker(get_settings().fleet_events_queue_size, get_settings().fleet_events_history)
+
+
+def configure(settings: Settings):
+    fleet_events.configure(settings.fleet_events_queue_size, settings.fleet_events_history)
+
+
+# -------- SERVER-SENT EVENTS --------
+
+def format_event(event) -> str:
+    seq, type, data = event
+    return f"id: {seq}\nevent: {type}\ndata: {data}\n\n"
+
+
+def format_resync(seq: int) -> str:
+    return f"id: {seq}\nevent: {RESYNC}\ndata: {{\"seq\":{seq}}}\n\n"
+
+
+async def stream(last_event_id: int | None = None, heartbeat: float | None = None):
+    """SSE body: replay, then live deltas, with a comment line as heartbeat."""
+    heartbeat = heartbeat or get_settings().fleet_events_heartbeat
+    subscription, replay = fleet_events.subscribe(last_event_id)
+    try:
+        # Ouvre le flux tout de suite (proxies, EventSource)
+        yield f"retry: 3000\n: connected seq={fleet_events.seq}\n\n"
+        batch = replay
+        while True:
+            if batch is None:
+                yield ": keep-alive\n\n"
+            elif batch == RESYNC:
+                yield format_resync(fleet_events.seq)
+            elif batch:
+                yield "".join(format_event(event) for event in batch)
+            batch = await subscription.next_batch(heartbeat)
+    finally:
+        fleet_events.unsubscribe(subscription)
@@ -0,0 +1,282 @@
+import asyncio
+from datetime import date, timedelta
+import logging
+import threading
+import time
+
+from sqlalchemy import exists, or_, select, update
+from starlette.concurrency import run_in_threadpool
+
+from api import archive
+from api.availability import availability_index
+from api.database import SessionLocal
+from api.events import fleet_events
+from api.models import Car, CarStatusEnum, Rental, RentalStatusEnum
+from api.response_cache import cars_cache
+from api.settings import Settings, get_settings
+
+# ---------------------------
+#   RENTAL LIFECYCLE SCHEDULER
+# ---------------------------
+#
+# Transitions appliquées en UPDATE ensemblistes par lots bornés
+# (UPDATE ... WHERE id IN (SELECT ... LIMIT n) RETURNING). Chaque UPDATE
+# re-vérifie le statut de départ : relancer une tâche ne change rien.
+# Lots, délai de grâce et intervalles : Settings (lifecycle_*).
+
+logger = logging.getLogger(__name__)
+
+
+def update_in_batches(db, statement_for, batch_size: int, returning):
+    """Run ``statement_for(limit)`` until a batch comes back short; yields
+    each batch's RETURNING rows once committed."""
+    while True:
+        rows = db.execute(statement_for(batch_size).returning(*returning)).all()
+        db.commit()
+        if rows:
+            yield rows
+        if len(rows) < batch_size:
+            return
+
+
+# -------- RENTAL TRANSITIONS --------
+
+def _close_batches(db, criteria, new_status: RentalStatusEnum, batch_size: int):
+    """Yield each committed batch of ``(rental_id, car_id)`` moved to ``new_status``."""
+    def statement(limit):
+        batch = select(Rental.id).where(*criteria).order_by(Rental.id).limit(limit)
+        return (
+            update(Rental)
+            .where(Rental.id.in_(batch.scalar_subquery()), *criteria)
+            .values(status=new_status)
+            .execution_options(synchronize_session=False)
+        )
+
+    for rows in update_in_batches(db, statement, batch_size, (Rental.id, Rental.car_id)):
+        for rental_id, car_id in rows:
+            availability_index.remove_rental(rental_id)
+            fleet_events.publish("rental.updated", {
+                "id": rental_id, "car_id": car_id, "status": new_status.value,
+            })
+        yield rows
+
+
+def _close_rentals(db, criteria, new_status: RentalStatusEnum, batch_size: int) -> int:
+    return sum(len(rows) for rows in _close_batches(db, criteria, new_status, batch_size))
+
+
+def expire_pending(db, today: date, batch_size: int | None = None) -> int:
+    """Cancel bookings never confirmed, pending_grace_days after their start."""
+    settings = get_settings()
+    cutoff = today - timedelta(days=settings.pending_grace_days)
+    return _close_rentals(
+        db,
+        (Rental.status == RentalStatusEnum.pending, Rental.start_date <= cutoff),
+        RentalStatusEnum.cancelled,
+        batch_size or settings.lifecycle_batch_size,
+    )
+
+
+def finish_rentals(db, today: date, batch_size: int | None = None) -> int:
+    """Finish confirmed rentals whose end_date is reached (end is exclusive),
+    and release their cars."""
+    batch_size = batch_size or get_settings().lifecycle_batch_size
+    criteria = (
+        Rental.status == RentalStatusEnum.confirmed,
+        Rental.end_date.isnot(None),
+        Rental.end_date <= today,
+    )
+    finished = 0
+    for rows in _close_batches(db, criteria, RentalStatusEnum.finished, batch_size):
+        release_cars(db, {car_id for _, car_id in rows if car_id is not None}, today, batch_size)
+        finished += len(rows)
+    return finished
+
+
+# -------- CAR STATUS --------
+
+def _active_rental(today: date):
+    return exists().where(
+        Rental.car_id == Car.id,
+        Rental.status == RentalStatusEnum.confirmed,
+        Rental.start_date <= today,
+        or_(Rental.end_date.is_(None), Rental.end_date > today),
+    )
+
+
+def _set_car_status(db, criteria, new_status: CarStatusEnum, batch_size: int) -> int:
+    def statement(limit):
+        batch = select(Car.id).where(*criteria).order_by(Car.id).limit(limit)
+        return (
+            update(Car)
+            .where(Car.id.in_(batch.scalar_subquery()), *criteria)
+            .values(status=new_status)
+            .execution_options(synchronize_session=False)
+        )
+
+    changed = 0
+    for rows in update_in_batches(db, statement, batch_size, (Car.id,)):
+        cars_cache.bump()
+        for (car_id,) in rows:
+            fleet_events.publish("car.updated", {"id": car_id, "status": new_status.value})
+        changed += len(rows)
+    return changed
+
+
+def sync_car_status(db, today: date, batch_size: int | None = None) -> int:
+    """Mark cars with a confirmed rental running today as rented.
+
+    Cars are released by finish_rentals, when their rental ends: a car
+    set to rented or maintenance by an admin is left alone.
+    """
+    return _set_car_status(
+        db,
+        (Car.status == CarStatusEnum.available, _active_rental(today)),
+        CarStatusEnum.rented,
+        batch_size or get_settings().lifecycle_batch_size,
+    )
+
+
+def release_cars(db, car_ids, today: date, batch_size: int | None = None) -> int:
+    """Set ``car_ids`` back to available unless another rental runs today."""
+    if not car_ids:
+        return 0
+    return _set_car_status(
+        db,
+        (Car.id.in_(sorted(car_ids)), Car.status == CarStatusEnum.rented, ~_active_rental(today)),
+        CarStatusEnum.available,
+        batch_size or get_settings().lifecycle_batch_size,
+    )
+
+
+# -------- ARCHIVE --------
+
+def archive_closed_rentals(db, today: date, batch_size: int | None = None) -> int:
+    """Move old closed rentals to the archive, then free some pages."""
+    moved = archive.archive_rentals(db, today, batch_size)
+    if moved and get_settings().archive_vacuum_pages > 0:
+        archive.compact(db.get_bind(), "incremental")
+    return moved
+
+
+# -------- SCHEDULER --------
+
+class Job:
+
+    def __init__(self, name: str, interval: float, func):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.due = 0.0
+        self.runs = 0
+        self.failures = 0
+        self.rows = 0
+        self.last_rows = 0
+        self.last_seconds = 0.0
+
+
+class LifecycleScheduler:
+    """Runs the jobs in order, each when due, on one asyncio task.
+
+    Jobs run one at a time in the threadpool with their own session, so
+    they never compete with each other for the SQLite write lock.
+    """
+
+    def __init__(self, jobs, batch_size: int):
+        self.jobs = jobs
+        self.batch_size = batch_size
+        self._task = None
+        self._lock = threading.Lock()
+
+    def run_job(self, job: Job, today: date | None = None) -> int:
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            rows = job.func(db, today or date.today(), self.batch_size)
+        except Exception:
+            db.rollback()
+            with self._lock:
+                job.failures += 1
+            logger.exception("lifecycle job %s failed", job.name)
+            raise
+        finally:
+            db.close()
+
+        with self._lock:
+            job.runs += 1
+            job.rows += rows
+            job.last_rows = rows
+            job.last_seconds = time.perf_counter() - start
+        return rows
+
+    def run_all(self, today: date | None = None) -> dict:
+        return {job.name: self.run_job(job, today) for job in self.jobs}
+
+    async def _loop(self):
+        while True:
+            now = time.monotonic()
+            for job in self.jobs:
+                if job.due <= now:
+                    try:
+                        await run_in_threadpool(self.run_job, job)
+                    except Exception:
+                        pass  # Déjà journalisé ; on retentera au prochain passage
+                    job.due = time.monotonic() + job.interval
+            await asyncio.sleep(max(0.0, min(job.due for job in self.jobs) - time.monotonic()))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                job.name: {
+                    "runs": job.runs,
+                    "failures": job.failures,
+                    "rows": job.rows,
+                    "last_rows": job.last_rows,
+                    "last_seconds": job.last_seconds,
+                }
+                for job in self.jobs
+            }
+
+
+def job_intervals(settings: Settings) -> dict:
+    return {
+        "expire_pending": settings.lifecycle_expire_interval,
+        "finish_rentals": settings.lifecycle_finish_interval,
+        "sync_car_status": settings.lifecycle_cars_interval,
+        "archive_rentals": settings.lifecycle_archive_interval,
+    }
+
+
+# Ordre voulu : les locations sont closes (et leurs voitures libérées)
+# avant que les voitures des locations du jour passent à "rented"
+_intervals = job_intervals(get_settings())
+scheduler = LifecycleScheduler(
+    [
+        Job("expire_pending", _intervals["expire_pending"], expire_pending),
+        Job("finish_rentals", _intervals["finish_rentals"], finish_rentals),
+        Job("sync_car_status", _intervals["sync_car_status"], sync_car_status),
+        Job("archive_rentals", _intervals["archive_rentals"], archive_closed_rentals),
+    ],
+    get_settings().lifecycle_batch_size,
+)
+
+
+def configure(settings: Settings):
+    """Apply batch size and intervals (taken into account at each job's next run)."""
+    intervals = job_intervals(settings)
+    scheduler.batch_size = settings.lifecycle_batch_size
+    for job in scheduler.jobs:
+        job.interval = intervals[job.name]
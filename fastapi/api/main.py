@@ -1,29 +1,203 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+
+from api.settings import Settings, get_settings, use_settings
+from api import (
+    database, deps, events, lifecycle, metrics, migrations, ratelimit, response_cache, search, write_queue,
+)
+from api.database import Base
+from api.deps import token_cache
+from api.events import fleet_events
+from api.response_cache import cars_cache
 
-from api.routers import auth, cars
-from api.database import Base, engine
+# ---------------------------
+#   STARTUP / SHUTDOWN
+# ---------------------------
+#
+# Rien ne touche la base à l'import : l'engine, le schéma et le pool sont
+# préparés dans le lifespan, une fois par processus worker.
 
-app = FastAPI()
+async def prepare_database(settings: Settings):
+    """Engine, schema (unless ``create_schema`` is off), SQL
+    instrumentation, then a warm connection pool."""
+    engine = database.configure(settings)
 
-# Create DB tables
-Base.metadata.create_all(bind=engine)
+    if settings.create_schema:
+        # Tables déclarées dans api.models, importé par les routers
+        Base.metadata.create_all(bind=engine)
+        # Colonnes / index ajoutés depuis la création d'une base existante
+        migrations.upgrade(engine)
+        # Car search index (FTS5 table + sync triggers)
+        search.install(engine)
+    else:
+        search.detect(engine)
+
+    # SQL instrumentation (query count / time per request, slow query log)
+    metrics.instrument_engine(engine)
+    if database.async_engine is not None:
+        metrics.instrument_engine(database.async_engine.sync_engine)
+
+    warm = settings.db_pool_size if settings.db_pool_warm is None else settings.db_pool_warm
+    warm = min(warm, settings.db_pool_size)
+    database.warm_pool(engine, warm)
+    if database.async_engine is not None:
+        await database.warm_async_pool(database.async_engine, warm)
+
+
+def lifespan_for(settings: Settings):
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await prepare_database(settings)
+        if settings.lifecycle_enabled:
+            lifecycle.scheduler.start()
+        yield
+        await lifecycle.scheduler.stop()
+        # Vide la file d'écriture avant de fermer
+        write_queue.writer.stop()
+        await database.dispose()
+
+    return lifespan
+
+
+router = APIRouter()
 
-# CORS configuration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
 # Health check
-@app.get("/")
+@router.get("/")
 def health_check():
     return {"message": "Health check complete"}
 
+
+# Prometheus metrics
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    caches = {"token": token_cache.stats(), "cars_response": cars_cache.stats()}
+    extra = [
+        ("cache_hits_total", "counter", "Cache hits.",
+         [({"cache": name}, stats["hits"]) for name, stats in caches.items()]),
+        ("cache_misses_total", "counter", "Cache misses.",
+         [({"cache": name}, stats["misses"]) for name, stats in caches.items()]),
+        ("cache_entries", "gauge", "Entries currently cached.",
+         [({"cache": name}, stats["size"]) for name, stats in caches.items()]),
+    ]
+    fleet = fleet_events.stats()
+    extra += [
+        ("fleet_event_subscribers", "gauge", "Open fleet status streams.", [({}, fleet["subscribers"])]),
+        ("fleet_events_published_total", "counter", "Fleet status events published.", [({}, fleet["published"])]),
+        ("fleet_event_resyncs_total", "counter", "Subscribers told to resync (slow or too far behind).",
+         [({}, fleet["resyncs"])]),
+    ]
+    writes = write_queue.writer.stats()
+    extra += [
+        ("group_commit_batches_total", "counter", "Transactions committed by the group-commit writer.",
+         [({}, writes["batches"])]),
+        ("group_commit_operations_total", "counter", "Write operations committed through group commit.",
+         [({}, writes["operations"])]),
+        ("group_commit_failed_commits_total", "counter", "Group commits that failed as a whole.",
+         [({}, writes["failed_commits"])]),
+    ]
+    buckets = {"ip": ratelimit.ip_buckets.stats(), "username": ratelimit.username_buckets.stats()}
+    slots = ratelimit.verification_slots.stats()
+    extra += [
+        ("auth_login_rejected_total", "counter", "Login attempts shed with 429 before verification.",
+         [({"reason": name}, stats["rejected"]) for name, stats in buckets.items()]
+         + [({"reason": "concurrency"}, slots["rejected"])]),
+        ("auth_rate_limit_keys", "gauge", "Rate limit buckets currently tracked.",
+         [({"key": name}, stats["size"]) for name, stats in buckets.items()]),
+        ("auth_verifications_in_flight", "gauge", "Password verifications in progress.",
+         [({}, slots["in_flight"])]),
+    ]
+    jobs = lifecycle.scheduler.stats()
+    extra += [
+        ("lifecycle_runs_total", "counter", "Lifecycle job runs.",
+         [({"job": name}, stats["runs"]) for name, stats in jobs.items()]),
+        ("lifecycle_failures_total", "counter", "Lifecycle job runs that raised.",
+         [({"job": name}, stats["failures"]) for name, stats in jobs.items()]),
+        ("lifecycle_rows_total", "counter", "Rows transitioned by lifecycle jobs.",
+         [({"job": name}, stats["rows"]) for name, stats in jobs.items()]),
+        ("lifecycle_last_run_rows", "gauge", "Rows transitioned by the last run.",
+         [({"job": name}, stats["last_rows"]) for name, stats in jobs.items()]),
+        ("lifecycle_last_run_seconds", "gauge", "Duration of the last run.",
+         [({"job": name}, stats["last_seconds"]) for name, stats in jobs.items()]),
+    ]
+    return PlainTextResponse(
+        metrics.render(extra),
+        media_type="text/plain; version=0.0.4"
+    )
+
 # Routers
-app.include_router(auth.router)
-app.include_router(cars.router)
+def without_overridden(router: APIRouter, overrides: APIRouter) -> APIRouter:
+    """Routes of ``router`` that ``overrides`` does not redefine."""
+    taken = {
+        (route.path, method)
+        for route in overrides.routes
+        for method in route.methods
+    }
+    remaining = APIRouter()
+    remaining.routes = [
+        route for route in router.routes
+        if not any((route.path, method) in taken for method in route.methods)
+    ]
+    return remaining
+
+
+def include_routers(app: FastAPI, settings: Settings):
+    from api.routers import admin, auth, cars, rentals, renters
+
+    app.include_router(router)
+
+    if settings.db_mode == "async":
+        from api.routers import auth_async, cars_async
+
+        # Routes sans version async restent servies en sync ; incluses en
+        # premier pour que /cars/export ne soit pas capturé par /cars/{car_id}
+        app.include_router(without_overridden(auth.router, auth_async.router))
+        app.include_router(without_overridden(cars.router, cars_async.router))
+        app.include_router(auth_async.router)
+        app.include_router(cars_async.router)
+    else:
+        app.include_router(auth.router)
+        app.include_router(cars.router)
+
+    app.include_router(rentals.router)
+    app.include_router(renters.router)
+    app.include_router(admin.router)
+
+
+# ---------------------------
+#   APPLICATION FACTORY
+# ---------------------------
+
+def create_app(settings: Settings | None = None) -> FastAPI:
+    """Build the application; the database is only touched at startup.
+
+    ``uvicorn --factory api.main:create_app`` builds it from the
+    environment; no instance is created at import.
+    """
+    settings = settings or get_settings()
+    # Lues à l'appel (JWT, seuils, état du scheduler) par le reste de l'API
+    use_settings(settings)
+    # Objets partagés construits à l'import : caches, pools, limites
+    for module in (deps, ratelimit, response_cache, events, write_queue, lifecycle):
+        module.configure(settings)
+
+    app = FastAPI(lifespan=lifespan_for(settings))
+    app.state.settings = settings
+
+    # CORS configuration
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Outermost: latency includes CORS handling
+    app.add_middleware(metrics.MetricsMiddleware)
 
+    include_routers(app, settings)
+    return app
@@ -0,0 +1,231 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+import logging
+import threading
+import time
+
+from sqlalchemy import event
+
+from api.settings import get_settings
+
+# ---------------------------
+#   REQUEST / SQL METRICS
+# ---------------------------
+#
+# Compteurs en mémoire, rendus au format texte Prometheus par /metrics.
+# Le coût par requête se limite à quelques additions sous un verrou.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+slow_query_logger = logging.getLogger("api.slow_query")
+
+
+class RequestStats:
+    __slots__ = ("scope", "queries", "query_seconds")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.queries = 0
+        self.query_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        # Renseigné par le routeur FastAPI une fois la route trouvée
+        route = self.scope.get("route")
+        return route.path if route is not None else "unmatched"
+
+
+# Propagée aux threads des routes sync (anyio copie le contexte)
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Registry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = {}
+        self.requests = {}
+        self.queries_per_request = {}
+        self.query_seconds = {}
+        self.queries_total = 0
+        self.slow_queries_total = 0
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        with self._lock:
+            key = (method, route)
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+            status_key = (method, route, str(status))
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+
+            histogram = self.queries_per_request.get(route)
+            if histogram is None:
+                histogram = self.queries_per_request[route] = Histogram(QUERY_COUNT_BUCKETS)
+            histogram.observe(stats.queries)
+
+            self.query_seconds[route] = self.query_seconds.get(route, 0.0) + stats.query_seconds
+
+    def observe_query(self, slow: bool):
+        with self._lock:
+            self.queries_total += 1
+            if slow:
+                self.slow_queries_total += 1
+
+
+registry = Registry()
+
+
+# -------- SQLALCHEMY HOOKS --------
+
+# Début stocké sur le contexte d'exécution, propre à chaque requête SQL :
+# une requête en erreur (doublon -> 409...) n'appelle pas after_cursor_execute
+# et ne laisse rien sur la connexion du pool
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_start", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += elapsed
+
+    slow = elapsed * 1000 >= get_settings().slow_query_ms
+    registry.observe_query(slow)
+    if slow:
+        route = stats.route if stats is not None else "-"
+        slow_query_logger.warning(
+            "slow query %.1f ms on %s: %s", elapsed * 1000, route, " ".join(statement.split())
+        )
+
+
+def instrument_engine(engine):
+    """Attach the query hooks to a sync Engine (or an AsyncEngine's sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# -------- ASGI MIDDLEWARE --------
+
+class MetricsMiddleware:
+    """Per-route latency and per-request SQL counts.
+
+    Plain ASGI rather than BaseHTTPMiddleware: no extra task or body
+    buffering per request. The route label is the matched path template
+    (``/cars/{car_id}``), so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request.reset(token)
+            registry.observe_request(scope["method"], stats.route, status_code, elapsed, stats)
+
+
+# -------- PROMETHEUS EXPOSITION --------
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _histogram_lines(name: str, histogram: Histogram, **labels):
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        yield f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}"
+    yield f"{name}_bucket{_labels(**labels, le='+Inf')} {histogram.count}"
+    yield f"{name}_sum{_labels(**labels)} {histogram.total}"
+    yield f"{name}_count{_labels(**labels)} {histogram.count}"
+
+
+def render(extra=()) -> str:
+    """Prometheus text format; ``extra`` holds ``(name, type, help, samples)``
+    tuples for metrics owned elsewhere (caches), ``samples`` being
+    ``(labels_dict, value)`` pairs."""
+    lines = []
+    with registry._lock:
+        lines.append("# HELP http_request_duration_seconds Request latency by route.")
+        lines.append("# TYPE http_request_duration_seconds histogram")
+        for (method, route), histogram in sorted(registry.latency.items()):
+            lines.extend(_histogram_lines("http_request_duration_seconds", histogram, method=method, route=route))
+
+        lines.append("# HELP http_requests_total Requests by route and status.")
+        lines.append("# TYPE http_requests_total counter")
+        for (method, route, status), count in sorted(registry.requests.items()):
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+        lines.append("# HELP db_queries_per_request SQL statements issued per request.")
+        lines.append("# TYPE db_queries_per_request histogram")
+        for route, histogram in sorted(registry.queries_per_request.items()):
+            lines.extend(_histogram_lines("db_queries_per_request", histogram, route=route))
+
+        lines.append("# HELP db_query_seconds_total Time spent in SQL per route.")
+        lines.append("# TYPE db_query_seconds_total counter")
+        for route, seconds in sorted(registry.query_seconds.items()):
+            lines.append(f"db_query_seconds_total{_labels(route=route)} {seconds}")
+
+        lines.append("# HELP db_queries_total SQL statements executed.")
+        lines.append("# TYPE db_queries_total counter")
+        lines.append(f"db_queries_total {registry.queries_total}")
+
+        lines.append("# HELP db_slow_queries_total SQL statements slower than slow_query_ms.")
+        lines.append("# TYPE db_slow_queries_total counter")
+        lines.append(f"db_slow_queries_total {registry.slow_queries_total}")
+
+    for name, kind, help_text, samples in extra:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{name}{_labels(**labels)} {value}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,68 @@
+import logging
+import sys
+
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateColumn
+
+from api.database import Base
+
+# ---------------------------
+#   SCHEMA UPGRADE
+# ---------------------------
+#
+# create_all ne crée que les tables absentes : une base existante ne
+# reçoit ni les nouvelles colonnes (cars.version, rentals.summarized...)
+# ni les nouveaux index. upgrade() les ajoute ; sans effet sur une base
+# déjà à jour, il tourne à chaque démarrage.
+
+logger = logging.getLogger(__name__)
+
+
+def missing_columns(conn, table) -> list:
+    existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+    return [column for column in table.columns if column.name not in existing]
+
+
+def upgrade(engine) -> list:
+    """Add missing columns and indexes to existing tables; returns the
+    statements run.
+
+    SQLite's ADD COLUMN refuses NOT NULL without a default, PRIMARY KEY
+    and UNIQUE: new columns must be nullable or carry a server_default.
+    """
+    # Tables déclarées dans api.models
+    import api.models  # noqa: F401
+
+    applied = []
+    # Une seule connexion : inspect(engine) en prendrait une seconde au pool
+    with engine.begin() as conn:
+        tables = set(inspect(conn).get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+
+            for column in missing_columns(conn, table):
+                ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                statement = f'ALTER TABLE "{table.name}" ADD COLUMN {ddl}'
+                conn.exec_driver_sql(statement)
+                applied.append(statement)
+
+            existing = {index["name"] for index in inspect(conn).get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(conn)
+                    applied.append(f"CREATE INDEX {index.name}")
+
+    for statement in applied:
+        logger.info("schema upgrade: %s", statement)
+    return applied
+
+
+if __name__ == "__main__":
+    # python -m api.migrations (bases gérées avec CREATE_SCHEMA=0)
+    from api.database import engine
+
+    Base.metadata.create_all(bind=engine)
+    applied = upgrade(engine)
+    print("\n".join(applied) or "schema up to date")
+    sys.exit(0)
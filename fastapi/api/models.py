@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Boolean, Date, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from api.database import Base
@@ -48,10 +48,19 @@ class Renter(Base):
     email = Column(String, unique=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Compte (POST /auth/) ; NULL pour un renter créé sans compte
+    username = Column(String(50))
+    hashed_password = Column(String)
+
     # Relationships
     cars = relationship("Car", back_populates="renter")
     rentals = relationship("Rental", back_populates="renter")
 
+    # Unicité par index : ADD COLUMN ... UNIQUE est refusé par SQLite
+    __table_args__ = (
+        Index("ix_renters_username", "username", unique=True),
+    )
+
 
 # -------------------- CAR --------------------
 
@@ -66,6 +75,9 @@ class Car(Base):
     status = Column(Enum(CarStatusEnum), nullable=False, default=CarStatusEnum.available)
     rental_price_per_day = Column(Float, nullable=False)
 
+    # Bumped by every booking (optimistic locking)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
     renter_id = Column(Integer, ForeignKey("renters.id"))
     admin_id = Column(Integer, ForeignKey("admins.id"))
 
@@ -77,6 +89,17 @@ class Car(Base):
     rentals = relationship("Rental", back_populates="car")
     admin = relationship("Admin", back_populates="cars")
 
+    # Composite indexes backing the keyset-paginated listing (sort_key, id)
+    __table_args__ = (
+        Index("ix_cars_status_id", "status", "id"),
+        Index("ix_cars_brand_id", "brand", "id"),
+        Index("ix_cars_brand_model_id", "brand", "model", "id"),
+        Index("ix_cars_model_id", "model", "id"),
+        Index("ix_cars_price_id", "rental_price_per_day", "id"),
+        Index("ix_cars_mileage_id", "mileage", "id"),
+        Index("ix_cars_status_price_id", "status", "rental_price_per_day", "id"),
+    )
+
 
 # -------------------- RENTAL --------------------
 
@@ -95,7 +118,60 @@ class Rental(Base):
     total_price = Column(Float)
     status = Column(Enum(RentalStatusEnum), default=RentalStatusEnum.pending)
 
+    # Folded into rental_summaries (finished rentals only)
+    summarized = Column(Boolean, nullable=False, default=False, server_default="0", index=True)
+
     # Relationships
     car = relationship("Car", back_populates="rentals")
     renter = relationship("Renter", back_populates="rentals")
     admin = relationship("Admin", back_populates="rentals")
+
+    # Overlap checks scan one car's bookings by start date
+    __table_args__ = (
+        Index("ix_rentals_car_start", "car_id", "start_date"),
+    )
+
+
+# -------------------- RENTAL ARCHIVE --------------------
+
+class RentalArchive(Base):
+    """Closed rentals moved out of ``rentals`` after the retention window.
+
+    Same columns as Rental, ids kept; no foreign keys so cars and renters
+    can still be deleted.
+    """
+    __tablename__ = "rentals_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    car_id = Column(Integer)
+    renter_id = Column(Integer)
+    admin_id = Column(Integer)
+
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date)
+    price_per_day = Column(Float)
+    total_price = Column(Float)
+    status = Column(Enum(RentalStatusEnum), nullable=False)
+    summarized = Column(Boolean, nullable=False, default=False, server_default="0")
+
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_rentals_archive_car_start", "car_id", "start_date"),
+        Index("ix_rentals_archive_renter_start", "renter_id", "start_date"),
+        Index("ix_rentals_archive_start", "start_date"),
+    )
+
+
+# -------------------- RENTAL SUMMARY --------------------
+
+class RentalSummary(Base):
+    """Finished rentals pre-aggregated per car and start month."""
+    __tablename__ = "rental_summaries"
+
+    car_id = Column(Integer, ForeignKey("cars.id"), primary_key=True)
+    month = Column(String(7), primary_key=True)  # "YYYY-MM"
+    rentals = Column(Integer, nullable=False, default=0)
+    rental_days = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
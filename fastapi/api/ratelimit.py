@@ -0,0 +1,177 @@
+from collections import OrderedDict
+import math
+import threading
+import time
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+
+from api.settings import Settings, get_settings
+
+# ---------------------------
+#   LOGIN ADMISSION CONTROL
+# ---------------------------
+#
+# Chaque tentative de connexion coûte un bcrypt. Avant toute requête DB
+# ou tout hachage : seau à jetons par IP, puis par username, puis une
+# place parmi les vérifications en cours. Sinon 429 + Retry-After.
+# Capacités, recharges et plafonds : Settings (auth_rate_*).
+
+
+class TokenBucketStore:
+    """Token buckets per key, in an LRU bounded to ``max_keys`` entries.
+
+    A bucket left alone long enough to refill completely behaves exactly
+    like a missing one, so idle entries are dropped from the cold end.
+    """
+
+    def __init__(self, capacity: float, per_minute: float, max_keys: int):
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.evictions = 0
+        self.configure(capacity, per_minute, max_keys)
+
+    def configure(self, capacity: float, per_minute: float, max_keys: int):
+        with self._lock:
+            self.capacity = capacity
+            self.rate = per_minute / 60
+            self.max_keys = max_keys
+            self.idle_ttl = capacity / self.rate if self.rate else math.inf
+
+    def take(self, key, now: float | None = None) -> float:
+        """Spend one token; returns 0, or the seconds until one is available."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._buckets.pop(key, None)
+            if entry is None:
+                tokens = self.capacity
+            else:
+                tokens, updated = entry
+                tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                self.rejected += 1
+                wait = (1 - tokens) / self.rate if self.rate else math.inf
+
+            self._buckets[key] = (tokens, now)
+            self._expire(now)
+            return wait
+
+    def _expire(self, now: float):
+        # Ordre d'accès : les entrées inactives sont au début
+        while self._buckets:
+            key, (_, updated) = next(iter(self._buckets.items()))
+            if now - updated < self.idle_ttl and len(self._buckets) <= self.max_keys:
+                break
+            del self._buckets[key]
+            if now - updated < self.idle_ttl:
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._buckets),
+                "maxsize": self.max_keys,
+                "rejected": self.rejected,
+                "evictions": self.evictions,
+            }
+
+
+class ConcurrencyLimit:
+    """Non-blocking cap on concurrent work: over the limit, callers are
+    refused instead of queued."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight >= self.limit:
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"in_flight": self.in_flight, "limit": self.limit, "rejected": self.rejected}
+
+
+def max_inflight_verifications(settings: Settings) -> int:
+    return settings.auth_max_inflight_verifications or settings.auth_hash_workers * 4
+
+
+_settings = get_settings()
+ip_buckets = TokenBucketStore(
+    _settings.auth_rate_ip_burst, _settings.auth_rate_ip_per_minute, _settings.auth_rate_max_keys
+)
+username_buckets = TokenBucketStore(
+    _settings.auth_rate_user_burst, _settings.auth_rate_user_per_minute, _settings.auth_rate_max_keys
+)
+verification_slots = ConcurrencyLimit(max_inflight_verifications(_settings))
+
+
+def configure(settings: Settings):
+    ip_buckets.configure(
+        settings.auth_rate_ip_burst, settings.auth_rate_ip_per_minute, settings.auth_rate_max_keys
+    )
+    username_buckets.configure(
+        settings.auth_rate_user_burst, settings.auth_rate_user_per_minute, settings.auth_rate_max_keys
+    )
+    verification_slots.limit = max_inflight_verifications(settings)
+
+
+def client_ip(request: Request) -> str:
+    if get_settings().auth_trust_forwarded_for:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def too_many_requests(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many login attempts, retry later",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+
+async def admit_login(
+    request: Request,
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+):
+    """Shed a login attempt before any DB lookup or bcrypt work.
+
+    Shares the route's parsed form (FastAPI caches the dependency); the
+    verification slot is held until the route is done.
+    """
+    wait = ip_buckets.take(client_ip(request))
+    if wait:
+        raise too_many_requests(wait)
+
+    wait = username_buckets.take(form_data.username.strip().lower())
+    if wait:
+        raise too_many_requests(wait)
+
+    if not verification_slots.try_acquire():
+        raise too_many_requests(1)
+    try:
+        yield
+    finally:
+        verification_slots.release()
+
+
+login_admission = Annotated[None, Depends(admit_login)]
@@ -0,0 +1,128 @@
+from collections import OrderedDict
+import hashlib
+import threading
+
+from fastapi import Request, Response, status
+
+from api import serialization
+from api.settings import Settings, get_settings
+
+# ---------------------------
+#   CONDITIONAL RESPONSE CACHE
+# ---------------------------
+#
+# Cache en mémoire, par processus : chaque worker a son propre compteur de
+# version, invalidé par les écritures qui passent par ce worker.
+
+
+class ResponseCache:
+    """LRU of serialized JSON bodies and their strong ETags.
+
+    Every entry is stamped with the table version it was built from;
+    ``bump()`` after a write makes all older entries unreachable, and a
+    body computed before a concurrent bump is never stored. Compressed
+    variants (gzip / br) are built on first request and kept with the entry.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.version = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    def bump(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == self.version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], entry[2], entry[3]
+            self.misses += 1
+            return None
+
+    def put(self, key, version: int, body: bytes):
+        """Store a body; returns ``(etag, variants)`` for ``respond``."""
+        etag = make_etag(body)
+        variants = {}
+        if self.maxsize <= 0:
+            return etag, variants
+        with self._lock:
+            if version != self.version:
+                return etag, variants
+            self._entries[key] = (version, body, etag, variants)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return etag, variants
+
+    def respond(self, request: Request, body: bytes, etag: str, variants: dict) -> Response:
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+        encoding = serialization.negotiate(request, body)
+        if encoding is not None:
+            variant = variants.get(encoding)
+            if variant is None:
+                # Une représentation par encodage : ETag distinct
+                variant = variants[encoding] = (
+                    serialization.compress(body, encoding),
+                    f'{etag[:-1]}-{encoding}"',
+                )
+            body, etag = variant
+            headers["ETag"] = etag
+            headers["Content-Encoding"] = encoding
+
+        if etag_matches(request, etag):
+            with self._lock:
+                self.not_modified += 1
+            headers.pop("Content-Encoding", None)
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return serialization.FastJSONResponse(content=body, headers=headers)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "version": self.version,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "evictions": self.evictions,
+            }
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def request_key(request: Request):
+    """Route path plus the query parameters, order-insensitive."""
+    return request.url.path, tuple(sorted(request.query_params.multi_items()))
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Comparaison faible, comme le veut If-None-Match
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in tags
+
+
+cars_cache = ResponseCache(get_settings().response_cache_size)
+
+
+def configure(settings: Settings):
+    cars_cache.maxsize = settings.response_cache_size
@@ -0,0 +1,99 @@
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from api import archive, database, lifecycle
+from api.deps import db_dependency, get_current_admin
+from api.settings import get_settings
+
+
+# Toutes les routes : token d'un admin existant (403 sinon)
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(get_current_admin)]
+)
+
+
+# ============================
+#         ANALYTICS
+# ============================
+
+# ---- Revenue per car / brand / month ----
+@router.get("/analytics/revenue")
+def get_revenue(
+    db: db_dependency,
+    group_by: Literal["car", "brand", "month"] = "month",
+):
+    # numpy n'est chargé qu'au premier rapport, pas au démarrage
+    from api import analytics
+
+    return {
+        "group_by": group_by,
+        "groups": analytics.revenue_report(db, group_by),
+    }
+
+
+# ---- Utilization over a date window ----
+@router.get("/analytics/utilization")
+def get_utilization(
+    db: db_dependency,
+    start_date: date,
+    end_date: date,
+):
+    if end_date <= start_date:
+        raise HTTPException(status_code=400, detail="end_date must be after start_date")
+
+    from api import analytics
+
+    return analytics.utilization_report(db, start_date, end_date)
+
+
+# ---- Fold finished rentals into the summary table ----
+@router.post("/analytics/summary/refresh")
+def refresh_analytics_summary(
+    db: db_dependency,
+    batch_size: int = Query(5000, ge=1, le=20000),
+):
+    from api import analytics
+
+    return {"folded": analytics.refresh_summary(db, batch_size)}
+
+
+# ============================
+#       RENTAL ARCHIVE
+# ============================
+
+# ---- Move old closed rentals to rentals_archive ----
+# VACUUM complet : python -m api.archive --vacuum full (bloque les écritures)
+@router.post("/archive/run")
+def run_archive(
+    db: db_dependency,
+    # Non renseignés : archive_retention_days / archive_batch_size des Settings
+    retention_days: int | None = Query(None, ge=0),
+    batch_size: int | None = Query(None, ge=1, le=20000),
+    vacuum: Literal["none", "incremental"] = "none",
+):
+    archived = archive.archive_rentals(db, date.today(), batch_size, retention_days)
+    result = {"archived": archived}
+    if vacuum != "none":
+        db.close()
+        result["vacuum"] = archive.compact(database.engine, vacuum)
+    return result
+
+
+# ============================
+#      RENTAL LIFECYCLE
+# ============================
+
+# ---- Run every lifecycle job now ----
+@router.post("/lifecycle/run")
+def run_lifecycle():
+    return {"rows": lifecycle.scheduler.run_all()}
+
+
+# ---- Lifecycle job stats ----
+@router.get("/lifecycle")
+def get_lifecycle_stats():
+    return {"enabled": get_settings().lifecycle_enabled, "jobs": lifecycle.scheduler.stats()}
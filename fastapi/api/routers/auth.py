@@ -3,34 +3,39 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 from jose import jwt
-from dotenv import load_dotenv
-import os
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.models import Admin, Renter
-from api.deps import db_dependency, bcrypt_context
-
-load_dotenv()
+from api.ratelimit import login_admission
+from api.deps import db_dependency, hash_password, verify_password
+from api.settings import get_settings
+from api.write_queue import is_unique_violation, write, write_async
 
 router = APIRouter(
     prefix='/auth',
     tags=['auth']
 )
 
-SECRET_KEY = os.getenv("AUTH_SECRET_KEY")
-ALGORITHM = os.getenv("AUTH_ALGORITHM")
-
 # ============================
 #           SCHEMAS
 # ============================
 
 class AdminCreateRequest(BaseModel):
     username: str
+    email: str
     password: str
 
 class RenterCreateRequest(BaseModel):
     username: str
     password: str
+    first_name: str
+    last_name: str
+    email: str | None = None
+    phone: str | None = None
+    address: str | None = None
 
 class Token(BaseModel):
     access_token: str
@@ -41,41 +46,104 @@ class Token(BaseModel):
 #        AUTH FUNCTIONS
 # ============================
 
-def create_access_token(username: str, user_id: int, expires_delta: timedelta):
+ADMIN_TOKEN_TTL = timedelta(minutes=30)
+RENTER_TOKEN_TTL = timedelta(minutes=20)
+
+def create_access_token(username: str, user_id: int, expires_delta: timedelta, role: str = "renter"):
     payload = {
         "sub": username,
         "id": user_id,
+        # Vérifié contre la table admins par admin_dependency
+        "role": role,
         "exp": datetime.now(timezone.utc) + expires_delta
     }
-    return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+    settings = get_settings()
+    return jwt.encode(payload, settings.auth_secret_key, algorithm=settings.auth_algorithm)
 
 
-# -------- ADMIN AUTH --------
+# Opérations sur une Session synchrone ; les routes async (DB_MODE=async)
+# les exécutent via AsyncSession.run_sync
 
-def authenticate_admin(username: str, password: str, db):
-    admin = db.query(Admin).filter(Admin.username == username).first()
+def _lookup(db, model, username: str):
+    return db.query(model).filter(model.username == username).first()
 
-    if not admin:
-        return False
 
-    if not bcrypt_context.verify(password, admin.hashed_password):
-        return False
+def _insert(db, model, fields: dict):
+    db.add(model(**fields))
+    db.flush()
 
-    return admin
 
+def _store_rehash(db, user, new_hash: str):
+    user.hashed_password = new_hash
+    db.commit()
 
-# -------- USER AUTH --------
 
-def authenticate_renter(username: str, password: str, db):
-    renter = db.query(Renter).filter(Renter.username == username).first()
+async def run_db(db, op, *args):
+    """``op(session, *args)`` off the event loop, for a Session or an AsyncSession."""
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(op, *args)
+    return await run_in_threadpool(op, db, *args)
+
+
+async def save_user(model, request: BaseModel, db):
+    """Insert ``model`` from a create request, its password hashed; 409 on
+    a taken username or email."""
+    fields = request.model_dump(exclude={"password"})
+    fields["hashed_password"] = await hash_password(request.password)
+
+    try:
+        if isinstance(db, AsyncSession):
+            await write_async(db, _insert, model, fields)
+        else:
+            await run_in_threadpool(write, db, _insert, model, fields)
+    except IntegrityError as e:
+        if not is_unique_violation(e):
+            raise
+        # "UNIQUE constraint failed: renters.username"
+        field = "Username" if ".username" in str(e.orig) else "Email"
+        raise HTTPException(status_code=409, detail=f"{field} already exists")
+
 
-    if not renter:
+def token_response(user, detail: str, expires_delta: timedelta) -> dict:
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=detail
+        )
+
+    role = "admin" if isinstance(user, Admin) else "renter"
+    token = create_access_token(user.username, user.id, expires_delta, role)
+    return {"access_token": token, "token_type": "bearer"}
+
+
+async def authenticate_user(model, username: str, password: str, db):
+    # Requêtes DB et bcrypt hors de la boucle
+    user = await run_db(db, _lookup, model, username)
+
+    if not user:
         return False
 
-    if not bcrypt_context.verify(password, renter.hashed_password):
+    valid, new_hash = await verify_password(password, user.hashed_password)
+
+    if not valid:
         return False
 
-    return renter
+    if new_hash:
+        await run_db(db, _store_rehash, user, new_hash)
+
+    return user
+
+
+# -------- ADMIN AUTH --------
+
+async def authenticate_admin(username: str, password: str, db):
+    return await authenticate_user(Admin, username, password, db)
+
+
+# -------- USER AUTH --------
+
+async def authenticate_renter(username: str, password: str, db):
+    return await authenticate_user(Renter, username, password, db)
 
 
 # ============================
@@ -85,13 +153,7 @@ def authenticate_renter(username: str, password: str, db):
 @router.post("/admin", status_code=status.HTTP_201_CREATED)
 async def create_admin(db: db_dependency, create_admin_request: AdminCreateRequest):
 
-    new_admin = Admin(
-        username=create_admin_request.username,
-        hashed_password=bcrypt_context.hash(create_admin_request.password)
-    )
-
-    db.add(new_admin)
-    db.commit()
+    await save_user(Admin, create_admin_request, db)
 
     return {"message": "Admin created successfully"}
 
@@ -99,23 +161,11 @@ async def create_admin(db: db_dependency, create_admin_request: AdminCreateReque
 @router.post('/admin/token', response_model=Token)
 async def admin_login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    admission: login_admission,
     db: db_dependency
 ):
-    admin = authenticate_admin(form_data.username, form_data.password, db)
-
-    if not admin:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid admin credentials"
-        )
-
-    token = create_access_token(
-        admin.username,
-        admin.id,
-        timedelta(minutes=30)
-    )
-
-    return {"access_token": token, "token_type": "bearer"}
+    admin = await authenticate_admin(form_data.username, form_data.password, db)
+    return token_response(admin, "Invalid admin credentials", ADMIN_TOKEN_TTL)
 
 
 # ============================
@@ -125,13 +175,7 @@ async def admin_login(
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_renter(db: db_dependency, create_renter_request: RenterCreateRequest):
 
-    new_renter = Renter(
-        username=create_renter_request.username,
-        hashed_password=bcrypt_context.hash(create_renter_request.password)
-    )
-
-    db.add(new_renter)
-    db.commit()
+    await save_user(Renter, create_renter_request, db)
 
     return {"message": "Renter created successfully"}
 
@@ -139,20 +183,8 @@ async def create_renter(db: db_dependency, create_renter_request: RenterCreateRe
 @router.post('/token', response_model=Token)
 async def login_renter(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    admission: login_admission,
     db: db_dependency
 ):
-    renter = authenticate_renter(form_data.username, form_data.password, db)
-
-    if not renter:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid user credentials"
-        )
-
-    token = create_access_token(
-        renter.username,
-        renter.id,
-        timedelta(minutes=20)
-    )
-
-    return {"access_token": token, "token_type": "bearer"}
+    renter = await authenticate_renter(form_data.username, form_data.password, db)
+    return token_response(renter, "Invalid user credentials", RENTER_TOKEN_TTL)
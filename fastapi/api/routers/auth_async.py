@@ -0,0 +1,69 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, status
+from fastapi.security import OAuth2PasswordRequestForm
+
+from api.models import Admin, Renter
+from api.ratelimit import login_admission
+from api.deps import async_db_dependency
+from api.routers.auth import (
+    ADMIN_TOKEN_TTL,
+    RENTER_TOKEN_TTL,
+    AdminCreateRequest,
+    RenterCreateRequest,
+    Token,
+    authenticate_user,
+    save_user,
+    token_response,
+)
+
+
+# Same routes as api.routers.auth, on AsyncSession (DB_MODE=async); the
+# helpers are shared and dispatch on the session type
+router = APIRouter(
+    prefix='/auth',
+    tags=['auth']
+)
+
+
+# ============================
+#        ROUTES ADMIN
+# ============================
+
+@router.post("/admin", status_code=status.HTTP_201_CREATED)
+async def create_admin(db: async_db_dependency, create_admin_request: AdminCreateRequest):
+
+    await save_user(Admin, create_admin_request, db)
+
+    return {"message": "Admin created successfully"}
+
+
+@router.post('/admin/token', response_model=Token)
+async def admin_login(
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    admission: login_admission,
+    db: async_db_dependency
+):
+    admin = await authenticate_user(Admin, form_data.username, form_data.password, db)
+    return token_response(admin, "Invalid admin credentials", ADMIN_TOKEN_TTL)
+
+
+# ============================
+#        ROUTES RENTER
+# ============================
+
+@router.post("/", status_code=status.HTTP_201_CREATED)
+async def create_renter(db: async_db_dependency, create_renter_request: RenterCreateRequest):
+
+    await save_user(Renter, create_renter_request, db)
+
+    return {"message": "Renter created successfully"}
+
+
+@router.post('/token', response_model=Token)
+async def login_renter(
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    admission: login_admission,
+    db: async_db_dependency
+):
+    renter = await authenticate_user(Renter, form_data.username, form_data.password, db)
+    return token_response(renter, "Invalid user credentials", RENTER_TOKEN_TTL)
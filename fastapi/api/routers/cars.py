@@ -1,11 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
-
+from typing import Annotated, List, Literal
+import base64
+import binascii
+import json
+
+from api import bulk, events, search, serialization
+from api.events import fleet_events
+from api.response_cache import cars_cache, request_key
 from api.models import Car, CarStatusEnum
 from api.deps import db_dependency
+from api.write_queue import is_unique_violation, write
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 
 router = APIRouter(
@@ -48,13 +59,184 @@ class CarResponse(BaseModel):
         from_attributes = True
 
 
+class CarPage(BaseModel):
+    items: List[CarResponse]
+    next_cursor: str | None = None
+
+
+CarSearchResults = TypeAdapter(List[CarResponse])
+
+
 # ============================
-#        ROUTES CRUD
+#      KEYSET PAGINATION
 # ============================
 
-# ---- Create Car ----
-@router.post("/", response_model=CarResponse, status_code=status.HTTP_201_CREATED)
-def create_car(car: CarCreate, db: db_dependency):
+# Colonnes autorisées pour le tri ; l'id sert toujours de départage
+SORT_COLUMNS = {
+    "id": Car.id,
+    "brand": Car.brand,
+    "model": Car.model,
+    "mileage": Car.mileage,
+    "rental_price_per_day": Car.rental_price_per_day,
+}
+
+SortKey = Literal["id", "brand", "model", "mileage", "rental_price_per_day"]
+
+# Types JSON admis pour la valeur de tri du curseur (None : colonne nullable)
+CURSOR_VALUE_TYPES = {
+    "id": (int,),
+    "brand": (str,),
+    "model": (str,),
+    "mileage": (int, type(None)),
+    "rental_price_per_day": (int, float),
+}
+
+
+def encode_cursor(value, car_id: int) -> str:
+    raw = json.dumps({"v": value, "id": car_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, sort_by: str = "id"):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value, car_id = data["v"], data["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # bool est un int pour Python, pas pour SQL
+    if (
+        type(car_id) is not int
+        or isinstance(value, bool)
+        or not isinstance(value, CURSOR_VALUE_TYPES[sort_by])
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, car_id
+
+
+def keyset_condition(column, value, car_id: int, descending: bool):
+    """Rows strictly after (value, car_id) in the listing order.
+
+    SQLite sorts NULLs first ascending and last descending, so a nullable
+    sort column (mileage) needs its own branches.
+    """
+    if descending:
+        if value is None:
+            return and_(column.is_(None), Car.id < car_id)
+        return or_(
+            column < value,
+            and_(column == value, Car.id < car_id),
+            column.is_(None),
+        )
+
+    if value is None:
+        return or_(and_(column.is_(None), Car.id > car_id), column.isnot(None))
+    return or_(column > value, and_(column == value, Car.id > car_id))
+
+
+class CarListing:
+    """A filtered, sorted page request; shared by the sync and async routes."""
+
+    def __init__(self, statement: Select, sort_by: str, limit: int):
+        self.statement = statement
+        self.sort_by = sort_by
+        self.limit = limit
+
+    def page(self, cars) -> dict:
+        next_cursor = None
+        if len(cars) > self.limit:
+            cars = cars[:self.limit]
+            last = cars[-1]
+            next_cursor = encode_cursor(getattr(last, self.sort_by), last.id)
+
+        return {"items": cars, "next_cursor": next_cursor}
+
+    @property
+    def row_statement(self) -> Select:
+        # Colonnes de CarResponse seulement : pas d'objets ORM à hydrater
+        return self.statement.with_only_columns(*serialization.CAR_COLUMNS)
+
+    def body(self, rows) -> bytes:
+        """Serialized CarPage from ``row_statement`` rows."""
+        page = self.page(rows)
+        page["items"] = serialization.rows_as_dicts(page["items"])
+        return serialization.dumps(page)
+
+
+def car_listing(
+    status: CarStatusEnum | None = None,
+    brand: str | None = None,
+    model: str | None = None,
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    min_mileage: int | None = Query(None, ge=0),
+    max_mileage: int | None = Query(None, ge=0),
+    sort_by: SortKey = "id",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+) -> CarListing:
+    query = select(Car)
+
+    if status is not None:
+        query = query.where(Car.status == status)
+    if brand is not None:
+        query = query.where(Car.brand == brand)
+    if model is not None:
+        query = query.where(Car.model == model)
+    if min_price is not None:
+        query = query.where(Car.rental_price_per_day >= min_price)
+    if max_price is not None:
+        query = query.where(Car.rental_price_per_day <= max_price)
+    if min_mileage is not None:
+        query = query.where(Car.mileage >= min_mileage)
+    if max_mileage is not None:
+        query = query.where(Car.mileage <= max_mileage)
+
+    column = SORT_COLUMNS[sort_by]
+    descending = order == "desc"
+
+    if cursor is not None:
+        value, last_id = decode_cursor(cursor, sort_by)
+        query = query.where(keyset_condition(column, value, last_id, descending))
+
+    if descending:
+        query = query.order_by(column.desc(), Car.id.desc())
+    else:
+        query = query.order_by(column.asc(), Car.id.asc())
+
+    # Une ligne de plus pour savoir s'il reste une page
+    return CarListing(query.limit(limit + 1), sort_by, limit)
+
+
+car_listing_dependency = Annotated[CarListing, Depends(car_listing)]
+
+
+# ============================
+#     CONDITIONAL READS
+# ============================
+
+def cached_read(request: Request, build):
+    """Serve a cached body (or 304), building and storing it on a miss."""
+    key = request_key(request)
+    cached = cars_cache.get(key)
+    if cached is not None:
+        return cars_cache.respond(request, *cached)
+
+    # Version lue avant la requête : un write concurrent invalide le résultat
+    version = cars_cache.version
+    body = build()
+    return cars_cache.respond(request, body, *cars_cache.put(key, version, body))
+
+
+# ============================
+#      WRITE OPERATIONS
+# ============================
+
+# Flush seulement : le commit revient à api.write_queue.write (seul, ou
+# regroupé avec d'autres requêtes quand GROUP_COMMIT=1)
+
+def insert_car(db: Session, car: CarCreate) -> CarResponse:
     new_car = Car(
         plate_number=car.plate_number,
         brand=car.brand,
@@ -64,44 +246,201 @@ def create_car(car: CarCreate, db: db_dependency):
         rental_price_per_day=car.rental_price_per_day
     )
     db.add(new_car)
-    db.commit()
-    db.refresh(new_car)
+    db.flush()
+    return CarResponse.model_validate(new_car)
+
+
+def apply_car_update(db: Session, car_id: int, update_data: CarUpdate) -> CarResponse:
+    car = db.get(Car, car_id)
+
+    if not car:
+        raise HTTPException(status_code=404, detail="Car not found")
+
+    for key, value in update_data.model_dump(exclude_unset=True).items():
+        setattr(car, key, value)
+
+    db.flush()
+    return CarResponse.model_validate(car)
+
+
+def remove_car(db: Session, car_id: int):
+    car = db.get(Car, car_id)
+
+    if not car:
+        raise HTTPException(status_code=404, detail="Car not found")
+
+    db.delete(car)
+    db.flush()
+
+
+# ============================
+#        ROUTES CRUD
+# ============================
+
+# ---- Create Car ----
+@router.post("/", response_model=CarResponse, status_code=status.HTTP_201_CREATED)
+def create_car(car: CarCreate, db: db_dependency):
+    try:
+        new_car = write(db, insert_car, car)
+    except IntegrityError as e:
+        if not is_unique_violation(e):
+            raise
+        raise HTTPException(status_code=409, detail="plate_number already exists")
+
+    cars_cache.bump()
+    fleet_events.publish("car.created", new_car.model_dump(mode="json"))
     return new_car
 
 
-# ---- Get All Cars ----
-@router.get("/", response_model=List[CarResponse])
-def get_cars(db: db_dependency):
-    cars = db.query(Car).all()
-    return cars
+# ---- Get All Cars (filtered, keyset-paginated) ----
+@router.get("/", response_model=CarPage, response_class=serialization.FastJSONResponse)
+def get_cars(request: Request, db: db_dependency, listing: car_listing_dependency):
+    def build():
+        return listing.body(db.execute(listing.row_statement).all())
+
+    return cached_read(request, build)
+
+
+# ---- Read Cache Stats ----
+@router.get("/cache/stats")
+def get_cars_cache_stats():
+    return cars_cache.stats()
+
+
+# ---- Fleet Status Stream (Server-Sent Events) ----
+@router.get("/events")
+async def stream_car_events(last_event_id: int | None = Header(None)):
+    return StreamingResponse(
+        events.stream(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# ---- Full-text Search (plate / brand / model) ----
+@router.get("/search", response_model=List[CarResponse])
+def search_cars(
+    request: Request,
+    db: db_dependency,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+):
+    if not search.available:
+        raise HTTPException(status_code=503, detail="Search is not available")
+
+    query = search.match_expression(q)
+
+    def build():
+        if query is None:
+            return b"[]"
+        cars = db.scalars(
+            select(Car).from_statement(search.SEARCH_SQL),
+            {"query": query, "limit": limit}
+        ).all()
+        return CarSearchResults.dump_json(cars)
+
+    return cached_read(request, build)
+
+
+# ---- Autocomplete ----
+@router.get("/suggest")
+def suggest_cars(
+    db: db_dependency,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+):
+    if not search.available:
+        raise HTTPException(status_code=503, detail="Search is not available")
+
+    query = search.match_expression(q)
+    if query is None:
+        return []
+
+    rows = db.execute(search.SUGGEST_SQL, {"query": query, "limit": limit * 5}).all()
+    return search.suggestions(rows, q, limit)
+
+
+# ---- Bulk Import (CSV / NDJSON) ----
+@router.post("/bulk")
+async def bulk_import_cars(
+    request: Request,
+    db: db_dependency,
+    format: Literal["csv", "ndjson"] | None = None,
+):
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "ndjson" if "json" in content_type else "csv"
+
+    lines = bulk.iter_lines(request.stream())
+    rows = bulk.iter_ndjson_rows(lines) if format == "ndjson" else bulk.iter_csv_rows(lines)
+
+    report = bulk.BulkImportReport()
+    batch = []
+
+    async for number, values, error in rows:
+        if error is not None:
+            report.error(number, error)
+            continue
+        try:
+            car = CarCreate.model_validate(values)
+        except ValidationError as e:
+            report.error(number, bulk.validation_message(e))
+            continue
+
+        batch.append((number, car.model_dump()))
+        if len(batch) >= bulk.BATCH_SIZE:
+            await run_in_threadpool(bulk.insert_batch, db, batch, report)
+            batch = []
+
+    if batch:
+        await run_in_threadpool(bulk.insert_batch, db, batch, report)
+
+    # Pas un événement par ligne : les abonnés rechargent la flotte
+    if report.inserted:
+        fleet_events.publish(events.RESYNC, {"reason": "bulk_import", "inserted": report.inserted})
+
+    return report.as_dict()
+
+
+# ---- Streaming Export (CSV / NDJSON) ----
+@router.get("/export")
+def export_cars(format: Literal["csv", "ndjson"] = "csv"):
+    if format == "ndjson":
+        return StreamingResponse(bulk.export_ndjson(), media_type="application/x-ndjson")
+
+    return StreamingResponse(
+        bulk.export_csv(),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=cars.csv"}
+    )
 
 
 # ---- Get Car by ID ----
 @router.get("/{car_id}", response_model=CarResponse)
-def get_car(car_id: int, db: db_dependency):
-    car = db.query(Car).filter(Car.id == car_id).first()
+def get_car(car_id: int, request: Request, db: db_dependency):
+    def build():
+        car = db.query(Car).filter(Car.id == car_id).first()
 
-    if not car:
-        raise HTTPException(status_code=404, detail="Car not found")
+        if not car:
+            raise HTTPException(status_code=404, detail="Car not found")
 
-    return car
+        return CarResponse.model_validate(car).model_dump_json().encode()
+
+    return cached_read(request, build)
 
 
 # ---- Update Car ----
 @router.put("/{car_id}", response_model=CarResponse)
 def update_car(car_id: int, update_data: CarUpdate, db: db_dependency):
-    car = db.query(Car).filter(Car.id == car_id).first()
-
-    if not car:
-        raise HTTPException(status_code=404, detail="Car not found")
+    try:
+        car = write(db, apply_car_update, car_id, update_data)
+    except IntegrityError as e:
+        if not is_unique_violation(e):
+            raise
+        raise HTTPException(status_code=409, detail="plate_number already exists")
 
-    update_dict = update_data.dict(exclude_unset=True)
-
-    for key, value in update_dict.items():
-        setattr(car, key, value)
-
-    db.commit()
-    db.refresh(car)
+    cars_cache.bump()
+    fleet_events.publish("car.updated", {"id": car_id, **update_data.model_dump(mode="json", exclude_unset=True)})
 
     return car
 
@@ -109,12 +448,8 @@ def update_car(car_id: int, update_data: CarUpdate, db: db_dependency):
 # ---- Delete Car ----
 @router.delete("/{car_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_car(car_id: int, db: db_dependency):
-    car = db.query(Car).filter(Car.id == car_id).first()
-
-    if not car:
-        raise HTTPException(status_code=404, detail="Car not found")
-
-    db.delete(car)
-    db.commit()
+    write(db, remove_car, car_id)
+    cars_cache.bump()
+    fleet_events.publish("car.deleted", {"id": car_id})
 
     return {"message": "Car deleted successfully"}
@@ -0,0 +1,110 @@
+from fastapi import APIRouter, HTTPException, Request, status
+from sqlalchemy.exc import IntegrityError
+
+from api import serialization
+from api.models import Car
+from api.deps import async_db_dependency
+from api.events import fleet_events
+from api.response_cache import cars_cache, request_key
+from api.routers.cars import (
+    CarCreate,
+    CarUpdate,
+    CarResponse,
+    CarPage,
+    apply_car_update,
+    car_listing_dependency,
+    insert_car,
+    remove_car,
+)
+from api.write_queue import is_unique_violation, write_async
+
+
+# Same routes as api.routers.cars, on AsyncSession (DB_MODE=async); the
+# write operations are the sync router's, run through write_async
+router = APIRouter(
+    prefix="/cars",
+    tags=["cars"]
+)
+
+
+# ============================
+#     CONDITIONAL READS
+# ============================
+
+async def cached_read(request: Request, build):
+    key = request_key(request)
+    cached = cars_cache.get(key)
+    if cached is not None:
+        return cars_cache.respond(request, *cached)
+
+    version = cars_cache.version
+    body = await build()
+    return cars_cache.respond(request, body, *cars_cache.put(key, version, body))
+
+
+# ============================
+#        ROUTES CRUD
+# ============================
+
+# ---- Create Car ----
+@router.post("/", response_model=CarResponse, status_code=status.HTTP_201_CREATED)
+async def create_car(car: CarCreate, db: async_db_dependency):
+    try:
+        new_car = await write_async(db, insert_car, car)
+    except IntegrityError as e:
+        if not is_unique_violation(e):
+            raise
+        raise HTTPException(status_code=409, detail="plate_number already exists")
+
+    cars_cache.bump()
+    fleet_events.publish("car.created", new_car.model_dump(mode="json"))
+    return new_car
+
+
+# ---- Get All Cars (filtered, keyset-paginated) ----
+@router.get("/", response_model=CarPage, response_class=serialization.FastJSONResponse)
+async def get_cars(request: Request, db: async_db_dependency, listing: car_listing_dependency):
+    async def build():
+        return listing.body((await db.execute(listing.row_statement)).all())
+
+    return await cached_read(request, build)
+
+
+# ---- Get Car by ID ----
+@router.get("/{car_id}", response_model=CarResponse)
+async def get_car(car_id: int, request: Request, db: async_db_dependency):
+    async def build():
+        car = await db.get(Car, car_id)
+
+        if not car:
+            raise HTTPException(status_code=404, detail="Car not found")
+
+        return CarResponse.model_validate(car).model_dump_json().encode()
+
+    return await cached_read(request, build)
+
+
+# ---- Update Car ----
+@router.put("/{car_id}", response_model=CarResponse)
+async def update_car(car_id: int, update_data: CarUpdate, db: async_db_dependency):
+    try:
+        car = await write_async(db, apply_car_update, car_id, update_data)
+    except IntegrityError as e:
+        if not is_unique_violation(e):
+            raise
+        raise HTTPException(status_code=409, detail="plate_number already exists")
+
+    cars_cache.bump()
+    fleet_events.publish("car.updated", {"id": car_id, **update_data.model_dump(mode="json", exclude_unset=True)})
+
+    return car
+
+
+# ---- Delete Car ----
+@router.delete("/{car_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_car(car_id: int, db: async_db_dependency):
+    await write_async(db, remove_car, car_id)
+    cars_cache.bump()
+    fleet_events.publish("car.deleted", {"id": car_id})
+
+    return {"message": "Car deleted successfully"}
@@ -0,0 +1,342 @@
+from datetime import date
+from typing import List
+import random
+import time
+
+from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import exists, or_, select, update
+from sqlalchemy.orm import joinedload, raiseload
+
+from api import archive, serialization
+from api.availability import availability_index, BLOCKING_STATUSES
+from api.events import fleet_events
+from api.models import Car, CarStatusEnum, Rental, RentalStatusEnum, Renter
+from api.deps import admin_dependency, db_dependency, renter_scope, user_dependency
+from api.routers.cars import CarResponse
+
+
+router = APIRouter(
+    prefix="/rentals",
+    tags=["rentals"]
+)
+
+# Tentatives avant de renvoyer 409 sur conflit de version
+MAX_BOOKING_RETRIES = 5
+
+
+# ============================
+#       Pydantic Schemas
+# ============================
+
+class RentalCreate(BaseModel):
+    car_id: int
+    start_date: date
+    end_date: date
+    # Réservation faite par un admin pour un renter ; ignoré pour un renter
+    renter_id: int | None = None
+
+
+class RentalResponse(BaseModel):
+    id: int
+    car_id: int | None
+    renter_id: int | None
+    start_date: date
+    end_date: date | None
+    price_per_day: float | None
+    total_price: float | None
+    status: RentalStatusEnum
+
+    class Config:
+        from_attributes = True
+
+
+class CarSummary(BaseModel):
+    id: int
+    plate_number: str
+    brand: str
+    model: str
+
+    class Config:
+        from_attributes = True
+
+
+class RenterSummary(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    email: str | None
+
+    class Config:
+        from_attributes = True
+
+
+class RentalHistoryItem(RentalResponse):
+    archived: bool
+
+
+class RentalDetail(RentalResponse):
+    car: CarSummary | None
+    renter: RenterSummary | None
+
+
+# Colonnes chargées pour les vues imbriquées
+CAR_SUMMARY_COLUMNS = (Car.id, Car.plate_number, Car.brand, Car.model)
+RENTER_SUMMARY_COLUMNS = (Renter.id, Renter.first_name, Renter.last_name, Renter.email)
+
+
+# ============================
+#        AVAILABILITY
+# ============================
+
+# ---- Cars free between start_date and end_date ----
+@router.get("/availability", response_model=List[CarResponse], response_class=serialization.FastJSONResponse)
+def get_available_cars(
+    db: db_dependency,
+    start_date: date,
+    end_date: date,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    if end_date <= start_date:
+        raise HTTPException(status_code=400, detail="end_date must be after start_date")
+
+    availability_index.ensure_loaded(db)
+    busy = availability_index.busy_cars(start_date, end_date)
+
+    # Ids seulement, puis chargement des voitures de la page
+    candidate_ids = (
+        row.id
+        for row in db.query(Car.id)
+        .filter(Car.status != CarStatusEnum.maintenance)
+        .order_by(Car.id)
+        .yield_per(1000)
+    )
+    free_ids = []
+    for car_id in candidate_ids:
+        if car_id not in busy:
+            free_ids.append(car_id)
+            if len(free_ids) == limit:
+                break
+
+    if not free_ids:
+        return serialization.FastJSONResponse([])
+
+    rows = db.execute(
+        select(*serialization.CAR_COLUMNS).where(Car.id.in_(free_ids)).order_by(Car.id)
+    ).all()
+    return serialization.FastJSONResponse(serialization.rows_as_dicts(rows))
+
+
+# ============================
+#          BOOKING
+# ============================
+
+def overlapping_rental(car_id: int, start_date: date, end_date: date):
+    return exists().where(
+        Rental.car_id == car_id,
+        Rental.status.in_(BLOCKING_STATUSES),
+        Rental.start_date < end_date,
+        or_(Rental.end_date.is_(None), Rental.end_date > start_date),
+    )
+
+
+def try_book(db, renter_id: int, booking: RentalCreate, admin_id: int | None = None):
+    """One optimistic attempt; returns the rental, or None on a version conflict.
+
+    The overlap check runs against the car version read first, and the
+    conditional UPDATE only succeeds if no other booking bumped it since.
+    Every exit ends the transaction so the connection goes back to the pool
+    before the session teardown (which needs a threadpool slot of its own).
+    """
+    car = db.execute(
+        select(Car.version, Car.status, Car.rental_price_per_day)
+        .where(Car.id == booking.car_id)
+    ).first()
+
+    if car is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Car not found")
+
+    if car.status == CarStatusEnum.maintenance:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Car is under maintenance")
+
+    if db.scalar(select(overlapping_rental(booking.car_id, booking.start_date, booking.end_date))):
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Car is not available for these dates")
+
+    claimed = db.execute(
+        update(Car)
+        .where(Car.id == booking.car_id, Car.version == car.version)
+        .values(version=Car.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+    if claimed.rowcount != 1:
+        db.rollback()
+        return None
+
+    days = (booking.end_date - booking.start_date).days
+    rental = Rental(
+        car_id=booking.car_id,
+        renter_id=renter_id,
+        admin_id=admin_id,
+        start_date=booking.start_date,
+        end_date=booking.end_date,
+        price_per_day=car.rental_price_per_day,
+        total_price=days * car.rental_price_per_day,
+        status=RentalStatusEnum.pending,
+    )
+    db.add(rental)
+    db.flush()
+    # Lu avant le commit : pas de refresh (et de connexion) après
+    created = RentalResponse.model_validate(rental)
+    db.commit()
+    return created
+
+
+def booking_parties(user: dict, booking: RentalCreate, db) -> tuple:
+    """``(renter_id, admin_id)`` of a booking.
+
+    A renter books for themselves. An admin (ids are a separate sequence)
+    books for the ``renter_id`` of the request and is recorded as admin_id.
+    """
+    own_id = renter_scope(user, db)
+    if own_id is not None:
+        return own_id, None
+
+    if booking.renter_id is None:
+        raise HTTPException(status_code=400, detail="renter_id is required for an admin booking")
+    if db.get(Renter, booking.renter_id) is None:
+        raise HTTPException(status_code=404, detail="Renter not found")
+    return booking.renter_id, user["id"]
+
+
+# ---- Book a Car ----
+@router.post("/", response_model=RentalResponse, status_code=status.HTTP_201_CREATED)
+def create_rental(booking: RentalCreate, user: user_dependency, db: db_dependency):
+    if booking.end_date <= booking.start_date:
+        raise HTTPException(status_code=400, detail="end_date must be after start_date")
+
+    renter_id, admin_id = booking_parties(user, booking, db)
+    # Termine la transaction de lecture avant les tentatives
+    db.rollback()
+
+    for attempt in range(MAX_BOOKING_RETRIES):
+        rental = try_book(db, renter_id, booking, admin_id)
+        if rental is not None:
+            availability_index.add_rental(rental)
+            fleet_events.publish("rental.created", rental.model_dump(
+                mode="json", include={"id", "car_id", "status", "start_date", "end_date"}
+            ))
+            return rental
+        # Petit backoff aléatoire avant de relire la version
+        time.sleep(random.uniform(0, 0.002 * (2 ** attempt)))
+
+    raise HTTPException(status_code=409, detail="Booking conflict, please retry")
+
+
+# ---- Confirm a Booking (admin) ----
+# pending -> confirmed ; sans confirmation, expire_pending annule la location
+@router.post("/{rental_id}/confirm", response_model=RentalResponse)
+def confirm_rental(rental_id: int, admin: admin_dependency, db: db_dependency):
+    rental = db.get(Rental, rental_id)
+
+    if not rental:
+        raise HTTPException(status_code=404, detail="Rental not found")
+
+    # Conditionnel : le planificateur a pu l'annuler entre-temps
+    confirmed = db.execute(
+        update(Rental)
+        .where(Rental.id == rental_id, Rental.status == RentalStatusEnum.pending)
+        .values(status=RentalStatusEnum.confirmed)
+        .execution_options(synchronize_session=False)
+    )
+
+    if confirmed.rowcount != 1:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Only pending rentals can be confirmed")
+
+    db.commit()
+    db.refresh(rental)
+    fleet_events.publish("rental.updated", {
+        "id": rental.id, "car_id": rental.car_id, "status": rental.status.value,
+    })
+    return rental
+
+
+# ============================
+#        NESTED READS
+# ============================
+
+def rental_detail_query():
+    # Une seule requête (JOINs) ; tout autre lazy load lève une erreur
+    return select(Rental).options(
+        joinedload(Rental.car).load_only(*CAR_SUMMARY_COLUMNS),
+        joinedload(Rental.renter).load_only(*RENTER_SUMMARY_COLUMNS),
+        raiseload("*"),
+    )
+
+
+# ---- List Rentals with car and renter ----
+# Un renter ne voit que ses locations ; un admin les voit toutes
+@router.get("/", response_model=List[RentalDetail])
+def get_rentals(
+    user: user_dependency,
+    db: db_dependency,
+    rental_status: RentalStatusEnum | None = Query(None, alias="status"),
+    car_id: int | None = None,
+    after_id: int | None = None,
+    limit: int = Query(50, ge=1, le=500),
+):
+    query = rental_detail_query()
+
+    renter_id = renter_scope(user, db)
+    if renter_id is not None:
+        query = query.where(Rental.renter_id == renter_id)
+    if rental_status is not None:
+        query = query.where(Rental.status == rental_status)
+    if car_id is not None:
+        query = query.where(Rental.car_id == car_id)
+    if after_id is not None:
+        query = query.where(Rental.id > after_id)
+
+    return db.scalars(query.order_by(Rental.id).limit(limit)).all()
+
+
+# ---- Rental history (hot table + archive) ----
+# Un renter ne lit que son historique (renter_id imposé) ; filtres libres pour un admin
+@router.get("/history", response_model=List[RentalHistoryItem])
+def get_rental_history(
+    user: user_dependency,
+    db: db_dependency,
+    car_id: int | None = None,
+    renter_id: int | None = None,
+    include_archive: bool = True,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
+    own_id = renter_scope(user, db)
+    if own_id is not None:
+        renter_id = own_id
+
+    query = archive.history_statement(car_id, renter_id, include_archive)
+    return db.execute(query.limit(limit).offset(offset)).all()
+
+
+# ---- Get Rental by ID ----
+@router.get("/{rental_id}", response_model=RentalDetail)
+def get_rental(rental_id: int, user: user_dependency, db: db_dependency):
+    query = rental_detail_query().where(Rental.id == rental_id)
+
+    # Location d'un autre renter : 404, comme une location inexistante
+    renter_id = renter_scope(user, db)
+    if renter_id is not None:
+        query = query.where(Rental.renter_id == renter_id)
+
+    rental = db.scalar(query)
+
+    if not rental:
+        raise HTTPException(status_code=404, detail="Rental not found")
+
+    return rental
@@ -0,0 +1,83 @@
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.orm import raiseload, selectinload
+
+from api.models import Rental, Renter
+from api.deps import admin_dependency, db_dependency, renter_scope, user_dependency
+from api.routers.rentals import CAR_SUMMARY_COLUMNS, CarSummary, RentalResponse
+
+
+router = APIRouter(
+    prefix="/renters",
+    tags=["renters"]
+)
+
+
+# ============================
+#       Pydantic Schemas
+# ============================
+
+class RentalWithCar(RentalResponse):
+    car: CarSummary | None
+
+
+class RenterDetail(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    address: str | None
+    phone: str | None
+    email: str | None
+    rentals: List[RentalWithCar]
+
+    class Config:
+        from_attributes = True
+
+
+# ============================
+#        NESTED READS
+# ============================
+
+def renter_detail_query():
+    # Renters, puis leurs locations, puis les voitures : trois requêtes
+    # quel que soit le nombre de lignes ; tout autre lazy load lève une erreur
+    return select(Renter).options(
+        selectinload(Renter.rentals)
+        .selectinload(Rental.car)
+        .load_only(*CAR_SUMMARY_COLUMNS),
+        raiseload("*"),
+    )
+
+
+# ---- List Renters with rentals and cars (admin) ----
+@router.get("/", response_model=List[RenterDetail])
+def get_renters(
+    admin: admin_dependency,
+    db: db_dependency,
+    after_id: int | None = None,
+    limit: int = Query(50, ge=1, le=200),
+):
+    query = renter_detail_query()
+
+    if after_id is not None:
+        query = query.where(Renter.id > after_id)
+
+    return db.scalars(query.order_by(Renter.id).limit(limit)).all()
+
+
+# ---- Get Renter by ID ----
+# Le renter lui-même, ou un admin
+@router.get("/{renter_id}", response_model=RenterDetail)
+def get_renter(renter_id: int, user: user_dependency, db: db_dependency):
+    if renter_scope(user, db) not in (None, renter_id):
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+
+    renter = db.scalar(renter_detail_query().where(Renter.id == renter_id))
+
+    if not renter:
+        raise HTTPException(status_code=404, detail="Renter not found")
+
+    return renter
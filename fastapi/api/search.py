@@ -0,0 +1,148 @@
+import logging
+import re
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+# ---------------------------
+#   CAR FULL-TEXT SEARCH (FTS5)
+# ---------------------------
+#
+# Table FTS5 à contenu externe sur cars(plate_number, brand, model),
+# tenue à jour par des triggers : toutes les écritures (ORM, bulk,
+# scripts) passent par là sans code dans les routes.
+
+logger = logging.getLogger(__name__)
+
+FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS cars_fts USING fts5(
+        plate_number, brand, model,
+        content='cars', content_rowid='id',
+        tokenize='unicode61', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cars_fts_ai AFTER INSERT ON cars BEGIN
+        INSERT INTO cars_fts(rowid, plate_number, brand, model)
+        VALUES (new.id, new.plate_number, new.brand, new.model);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cars_fts_ad AFTER DELETE ON cars BEGIN
+        INSERT INTO cars_fts(cars_fts, rowid, plate_number, brand, model)
+        VALUES ('delete', old.id, old.plate_number, old.brand, old.model);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cars_fts_au AFTER UPDATE OF plate_number, brand, model ON cars BEGIN
+        INSERT INTO cars_fts(cars_fts, rowid, plate_number, brand, model)
+        VALUES ('delete', old.id, old.plate_number, old.brand, old.model);
+        INSERT INTO cars_fts(rowid, plate_number, brand, model)
+        VALUES (new.id, new.plate_number, new.brand, new.model);
+    END
+    """,
+)
+
+# Poids bm25 par colonne : la plaque compte plus que marque / modèle
+RANK = "bm25(cars_fts, 10.0, 2.0, 2.0)"
+
+SEARCH_SQL = text(f"""
+    SELECT cars.* FROM cars_fts
+    JOIN cars ON cars.id = cars_fts.rowid
+    WHERE cars_fts MATCH :query
+    ORDER BY {RANK}, cars.id
+    LIMIT :limit
+""")
+
+SUGGEST_SQL = text(f"""
+    SELECT cars_fts.plate_number, cars_fts.brand, cars_fts.model FROM cars_fts
+    WHERE cars_fts MATCH :query
+    ORDER BY {RANK}
+    LIMIT :limit
+""")
+
+available = False
+
+
+def install(engine):
+    """Create the FTS table and triggers if missing; rebuild on first install."""
+    global available
+    if engine.url.get_backend_name() != "sqlite":
+        return
+    try:
+        with engine.begin() as conn:
+            existed = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = 'cars_fts'")
+            ).first() is not None
+            for ddl in FTS_DDL:
+                conn.exec_driver_sql(ddl)
+            if not existed:
+                conn.exec_driver_sql("INSERT INTO cars_fts(cars_fts) VALUES ('rebuild')")
+        available = True
+    except OperationalError as e:
+        # SQLite compilé sans FTS5
+        logger.warning("car search disabled: %s", e)
+
+
+def detect(engine):
+    """Enable search when the FTS table already exists (schema managed
+    outside the app)."""
+    global available
+    if engine.url.get_backend_name() != "sqlite":
+        return
+    with engine.connect() as conn:
+        available = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'cars_fts'")
+        ).first() is not None
+    if not available:
+        logger.warning("car search disabled: cars_fts is missing (python -m api.search rebuild)")
+
+
+def rebuild(engine):
+    """Regenerate the whole index from the cars table."""
+    with engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO cars_fts(cars_fts) VALUES ('rebuild')")
+        conn.exec_driver_sql("INSERT INTO cars_fts(cars_fts) VALUES ('optimize')")
+
+
+def match_expression(q: str) -> str | None:
+    """User input to an FTS5 query: every word must match as a prefix."""
+    tokens = re.findall(r"\w+", q.lower())
+    if not tokens:
+        return None
+    return " AND ".join(f'"{token}"*' for token in tokens)
+
+
+def suggestions(rows, q: str, limit: int) -> list:
+    """Distinct field values, in rank order, containing a word that starts
+    with the last typed word."""
+    last = re.findall(r"\w+", q.lower())[-1]
+    seen = set()
+    found = []
+    for row in rows:
+        for field in ("plate_number", "brand", "model"):
+            value = getattr(row, field)
+            if (field, value) in seen:
+                continue
+            if any(word.startswith(last) for word in re.findall(r"\w+", value.lower())):
+                seen.add((field, value))
+                found.append({"field": field, "value": value})
+                if len(found) == limit:
+                    return found
+    return found
+
+
+if __name__ == "__main__":
+    # python -m api.search rebuild
+    if sys.argv[1:] != ["rebuild"]:
+        sys.exit("usage: python -m api.search rebuild")
+
+    from api.database import Base, engine
+    import api.models  # noqa: F401 (déclare les tables)
+
+    Base.metadata.create_all(bind=engine)
+    install(engine)
+    rebuild(engine)
+    print("cars_fts rebuilt")
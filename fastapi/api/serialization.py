@@ -0,0 +1,107 @@
+import gzip
+import json
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import String, type_coerce
+
+from api.models import Car
+from api.settings import get_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson est dans requirements.txt
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    # br reste optionnel : sans le paquet, seul gzip est proposé
+    brotli = None
+
+# ---------------------------
+#   FAST JSON SERIALIZATION
+# ---------------------------
+#
+# Lignes brutes (pas d'objets ORM ni de validation Pydantic) sérialisées
+# directement en bytes. L'ordre des colonnes suit CarResponse : le JSON
+# produit est identique octet pour octet, ETags compris.
+
+CAR_COLUMNS = (
+    Car.id,
+    Car.plate_number,
+    Car.brand,
+    Car.model,
+    Car.mileage,
+    # Stocké sous le nom de l'enum, identique à sa valeur
+    type_coerce(Car.status, String).label("status"),
+    Car.rental_price_per_day,
+)
+
+CAR_KEYS = tuple(column.key for column in CAR_COLUMNS)
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def rows_as_dicts(rows, keys=CAR_KEYS) -> list:
+    return [dict(zip(keys, row)) for row in rows]
+
+
+class FastJSONResponse(Response):
+    """JSON response for plain dicts/lists/rows already shaped like the
+    response model; skips FastAPI's jsonable_encoder pass."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+# -------- COMPRESSION --------
+
+def quality(params) -> float:
+    """q-value of an Accept-Encoding entry (1 when absent, 0 when invalid)."""
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value.strip())
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def accepted_encoding(request: Request) -> str | None:
+    header = request.headers.get("accept-encoding", "")
+    offered = set()
+    for part in header.split(","):
+        coding, *params = part.split(";")
+        # q=0, q=0.0, q=0.000 : codage refusé
+        if quality(params) > 0:
+            offered.add(coding.strip().lower())
+    if brotli is not None and "br" in offered:
+        return "br"
+    if "gzip" in offered:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    settings = get_settings()
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.brotli_quality)
+    return gzip.compress(body, compresslevel=settings.gzip_level, mtime=0)
+
+
+def negotiate(request: Request, body: bytes) -> str | None:
+    """Encoding to apply to ``body`` for this request, if any."""
+    # Corps plus petits : envoyés tels quels
+    if len(body) < get_settings().compress_min_size:
+        return None
+    return accepted_encoding(request)
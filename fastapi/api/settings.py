@@ -0,0 +1,190 @@
+import os
+from typing import Literal
+
+from dotenv import load_dotenv
+from pydantic import BaseModel, Field, field_validator
+
+# ---------------------------
+#   APPLICATION SETTINGS
+# ---------------------------
+#
+# Configuration lue une seule fois dans un objet Settings, passé à
+# create_app(). Les réglages fins (tailles de cache, limites, intervalles)
+# y vivent aussi : les modules les lisent via get_settings(), et leurs
+# objets partagés sont reconfigurés par create_app().
+
+load_dotenv()
+
+# Champ -> variable d'environnement
+ENV_VARS = {
+    "database_url": "DATABASE_URL",
+    "db_mode": "DB_MODE",
+    "db_pool_size": "DB_POOL_SIZE",
+    "db_max_overflow": "DB_MAX_OVERFLOW",
+    "db_pool_timeout": "DB_POOL_TIMEOUT",
+    "db_pool_warm": "DB_POOL_WARM",
+    "create_schema": "CREATE_SCHEMA",
+    "sqlite_journal_mode": "SQLITE_JOURNAL_MODE",
+    "sqlite_synchronous": "SQLITE_SYNCHRONOUS",
+    "sqlite_mmap_size": "SQLITE_MMAP_SIZE",
+    "sqlite_busy_timeout_ms": "SQLITE_BUSY_TIMEOUT_MS",
+    "sqlite_auto_vacuum": "SQLITE_AUTO_VACUUM",
+    "auth_secret_key": "AUTH_SECRET_KEY",
+    "auth_algorithm": "AUTH_ALGORITHM",
+    "cors_origins": "CORS_ORIGINS",
+    "lifecycle_enabled": "LIFECYCLE_ENABLED",
+    "auth_bcrypt_rounds": "AUTH_BCRYPT_ROUNDS",
+    "auth_hash_workers": "AUTH_HASH_WORKERS",
+    "auth_token_cache_size": "AUTH_TOKEN_CACHE_SIZE",
+    "auth_rate_ip_burst": "AUTH_RATE_IP_BURST",
+    "auth_rate_ip_per_minute": "AUTH_RATE_IP_PER_MINUTE",
+    "auth_rate_user_burst": "AUTH_RATE_USER_BURST",
+    "auth_rate_user_per_minute": "AUTH_RATE_USER_PER_MINUTE",
+    "auth_rate_max_keys": "AUTH_RATE_MAX_KEYS",
+    "auth_max_inflight_verifications": "AUTH_MAX_INFLIGHT_VERIFICATIONS",
+    "auth_trust_forwarded_for": "AUTH_TRUST_FORWARDED_FOR",
+    "response_cache_size": "RESPONSE_CACHE_SIZE",
+    "compress_min_size": "COMPRESS_MIN_SIZE",
+    "gzip_level": "GZIP_LEVEL",
+    "brotli_quality": "BROTLI_QUALITY",
+    "group_commit": "GROUP_COMMIT",
+    "group_commit_window_ms": "GROUP_COMMIT_WINDOW_MS",
+    "group_commit_max_batch": "GROUP_COMMIT_MAX_BATCH",
+    "slow_query_ms": "SLOW_QUERY_MS",
+    "fleet_events_queue_size": "FLEET_EVENTS_QUEUE_SIZE",
+    "fleet_events_history": "FLEET_EVENTS_HISTORY",
+    "fleet_events_heartbeat": "FLEET_EVENTS_HEARTBEAT",
+    "lifecycle_batch_size": "LIFECYCLE_BATCH_SIZE",
+    "pending_grace_days": "PENDING_GRACE_DAYS",
+    "lifecycle_expire_interval": "LIFECYCLE_EXPIRE_INTERVAL",
+    "lifecycle_finish_interval": "LIFECYCLE_FINISH_INTERVAL",
+    "lifecycle_cars_interval": "LIFECYCLE_CARS_INTERVAL",
+    "lifecycle_archive_interval": "LIFECYCLE_ARCHIVE_INTERVAL",
+    "archive_retention_days": "ARCHIVE_RETENTION_DAYS",
+    "archive_batch_size": "ARCHIVE_BATCH_SIZE",
+    "archive_vacuum_pages": "ARCHIVE_VACUUM_PAGES",
+}
+
+
+class Settings(BaseModel):
+    database_url: str = "sqlite:///./rental_car_app.db"
+
+    # "sync" (Session) ou "async" (AsyncSession + aiosqlite)
+    db_mode: Literal["sync", "async"] = "sync"
+
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+
+    # Connexions ouvertes au démarrage (None : toute la taille du pool)
+    db_pool_warm: int | None = None
+
+    # CREATE_SCHEMA=0 en production : le schéma est géré à part
+    create_schema: bool = True
+
+    # SQLite pragmas applied on every new connection
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_busy_timeout_ms: int = 5000
+
+    # Pris en compte à la création du fichier seulement (ou après un VACUUM)
+    sqlite_auto_vacuum: str = "INCREMENTAL"
+
+    auth_secret_key: str | None = None
+    auth_algorithm: str | None = None
+
+    cors_origins: list[str] = ["http://localhost:3000"]
+
+    lifecycle_enabled: bool = True
+
+    # ---- Auth: bcrypt cost, hashing pool, verified token cache ----
+    # Changer le coût marque les anciens hashes à refaire au prochain login
+    auth_bcrypt_rounds: int = 12
+    auth_hash_workers: int = Field(default_factory=lambda: min(4, os.cpu_count() or 1))
+    auth_token_cache_size: int = 10000
+
+    # ---- Login admission: token buckets (burst, refill per minute) ----
+    auth_rate_ip_burst: float = 20
+    auth_rate_ip_per_minute: float = 30
+    auth_rate_user_burst: float = 5
+    auth_rate_user_per_minute: float = 10
+    # Clés suivies au plus par magasin (les plus anciennes sont oubliées)
+    auth_rate_max_keys: int = 100000
+    # bcrypt en cours au plus, file du pool comprise (None : 4 par worker)
+    auth_max_inflight_verifications: int | None = None
+    # Derrière un proxy de confiance seulement
+    auth_trust_forwarded_for: bool = False
+
+    # ---- Responses ----
+    response_cache_size: int = 1024
+    # Corps plus petits : envoyés sans compression
+    compress_min_size: int = 1024
+    gzip_level: int = 5
+    brotli_quality: int = 4
+
+    # ---- Writes: group commit (single writer thread) ----
+    group_commit: bool = False
+    group_commit_window_ms: float = 2
+    group_commit_max_batch: int = 64
+
+    slow_query_ms: float = 100
+
+    # ---- Fleet events (SSE) ----
+    fleet_events_queue_size: int = 256
+    fleet_events_history: int = 1024
+    fleet_events_heartbeat: float = 15
+
+    # ---- Rental lifecycle: batches, pending grace, intervals (s) ----
+    lifecycle_batch_size: int = 500
+    # Une location encore "pending" ce nombre de jours après son début est annulée
+    pending_grace_days: int = 1
+    lifecycle_expire_interval: float = 300
+    lifecycle_finish_interval: float = 300
+    lifecycle_cars_interval: float = 60
+    lifecycle_archive_interval: float = 86400
+
+    # ---- Rental archive ----
+    archive_retention_days: int = 365
+    archive_batch_size: int = 1000
+    # Pages libérées par passage du job (0 : pas de vacuum automatique)
+    archive_vacuum_pages: int = 2000
+
+    class Config:
+        frozen = True
+
+    @field_validator("cors_origins", mode="before")
+    @classmethod
+    def split_origins(cls, value):
+        # CORS_ORIGINS="http://a,http://b"
+        if isinstance(value, str):
+            return [origin.strip() for origin in value.split(",") if origin.strip()]
+        return value
+
+    @classmethod
+    def from_env(cls, environ=None) -> "Settings":
+        """Settings from the environment (``.env`` included); unset
+        variables keep their defaults."""
+        environ = os.environ if environ is None else environ
+        return cls(**{
+            field: environ[name]
+            for field, name in ENV_VARS.items()
+            if name in environ
+        })
+
+
+_settings = None
+
+
+def get_settings() -> Settings:
+    """Process settings: those given to create_app(), or read from the
+    environment on first use."""
+    global _settings
+    if _settings is None:
+        _settings = Settings.from_env()
+    return _settings
+
+
+def use_settings(settings: Settings):
+    global _settings
+    _settings = settings
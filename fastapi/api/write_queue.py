@@ -0,0 +1,194 @@
+from concurrent.futures import Future
+import queue
+import threading
+import time
+
+from api.database import SessionLocal
+from api.settings import Settings, get_settings
+
+# ---------------------------
+#   GROUP COMMIT (single writer)
+# ---------------------------
+#
+# Avec group_commit (GROUP_COMMIT=1), les écritures des routes sont envoyées à un thread
+# écrivain unique qui les exécute dans une seule transaction (un fsync)
+# par fenêtre de temps ou de taille. Chaque opération tourne dans son
+# propre SAVEPOINT : son erreur (doublon, 404...) ne touche qu'elle.
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """Collects ``op(db, *args)`` calls and commits them together.
+
+    A batch starts with the first queued operation and closes after
+    ``window`` seconds or ``max_batch`` operations, whichever comes first.
+    If the final COMMIT itself fails, every operation of the batch gets
+    that error.
+    """
+
+    def __init__(self, session_factory, window: float, max_batch: int):
+        self.session_factory = session_factory
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.operations = 0
+        self.failed_commits = 0
+        self.largest_batch = 0
+
+    def submit(self, op, *args) -> Future:
+        self._ensure_started()
+        future = Future()
+        self._queue.put((future, op, args))
+        return future
+
+    def run(self, op, *args):
+        """Submit and wait; returns the operation's result or raises its error."""
+        return self.submit(op, *args).result()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="group-commit", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Finish the queued operations, then stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def _collect(self, first) -> tuple:
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch, stopping = self._collect(item)
+            self._commit(batch)
+            if stopping:
+                return
+
+    def _commit(self, batch):
+        outcomes = []
+        db = self.session_factory()
+        try:
+            if db.get_bind().dialect.name == "sqlite":
+                # pysqlite n'ouvre pas de transaction avant un SAVEPOINT :
+                # sans BEGIN explicite, chaque RELEASE validerait seul.
+                # IMMEDIATE prend le verrou d'écriture dès le début.
+                db.connection().exec_driver_sql("BEGIN IMMEDIATE")
+
+            for future, op, args in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with db.begin_nested():
+                        outcomes.append((future, op(db, *args), None))
+                except Exception as e:
+                    outcomes.append((future, None, e))
+
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            with self._lock:
+                self.failed_commits += 1
+            for future, _, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            db.close()
+
+        with self._lock:
+            self.batches += 1
+            self.operations += len(outcomes)
+            self.largest_batch = max(self.largest_batch, len(outcomes))
+
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": get_settings().group_commit,
+                "batches": self.batches,
+                "operations": self.operations,
+                "failed_commits": self.failed_commits,
+                "largest_batch": self.largest_batch,
+                "queued": self._queue.qsize(),
+            }
+
+
+writer = GroupCommitWriter(
+    SessionLocal, get_settings().group_commit_window_ms / 1000, get_settings().group_commit_max_batch
+)
+
+
+def configure(settings: Settings):
+    # Lus par le thread écrivain à chaque lot
+    writer.window = settings.group_commit_window_ms / 1000
+    writer.max_batch = settings.group_commit_max_batch
+
+
+def is_unique_violation(error) -> bool:
+    """IntegrityError raised by a UNIQUE constraint (vs NOT NULL, FK...)."""
+    return "UNIQUE" in str(error.orig).upper()
+
+
+def write(db, op, *args):
+    """Run a write operation: through the group-commit writer when enabled,
+    else on the request session with its own commit.
+
+    ``op(db, *args)`` must only flush, and return plain data (not ORM
+    objects): the writer's session is closed once the batch commits.
+    """
+    if get_settings().group_commit:
+        return writer.run(op, *args)
+    try:
+        result = op(db, *args)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result
+
+
+async def write_async(db, op, *args):
+    """``write`` for an AsyncSession (DB_MODE=async, no group commit).
+
+    ``op`` runs on the session's sync view (``AsyncSession.run_sync``):
+    sync and async routes share the same write operations.
+    """
+    try:
+        result = await db.run_sync(op, *args)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return result
@@ -0,0 +1,87 @@
+"""Availability index benchmark.
+
+Builds the interval index over N synthetic rentals, then times window
+queries against a brute-force overlap scan. Correctness is covered by
+tests/test_availability.py.
+
+    python -m benchmarks.bench_availability --rentals 100000 --cars 2000
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from api.availability import AvailabilityIndex, OPEN_END
+
+
+def generate(rentals: int, cars: int, seed: int):
+    rng = random.Random(seed)
+    origin = date(2020, 1, 1)
+    rows = []
+    for rental_id in range(1, rentals + 1):
+        start = origin + timedelta(days=rng.randrange(0, 3650))
+        end = None if rng.random() < 0.01 else start + timedelta(days=rng.randint(1, 30))
+        rows.append((rental_id, rng.randint(1, cars), start, end))
+    return rows
+
+
+def build(rows):
+    index = AvailabilityIndex()
+    for rental_id, car_id, start, end in rows:
+        index._add(rental_id, car_id, start, end)
+    index.loaded = True
+    return index
+
+
+def brute_busy(rows, start, end):
+    return {
+        car_id
+        for _, car_id, s, e in rows
+        if s < end and (e or OPEN_END) > start
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rentals", type=int, default=100_000)
+    parser.add_argument("--cars", type=int, default=2_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--check", type=int, default=50, help="windows timed on the full scan")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rows = generate(args.rentals, args.cars, args.seed)
+    rng = random.Random(args.seed + 1)
+    windows = []
+    for _ in range(args.queries):
+        start = date(2020, 1, 1) + timedelta(days=rng.randrange(0, 3650))
+        windows.append((start, start + timedelta(days=rng.randint(1, 14))))
+
+    t0 = time.perf_counter()
+    index = build(rows)
+    build_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for start, end in windows:
+        index.busy_cars(start, end)
+    index_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for start, end in windows[:args.check]:
+        brute_busy(rows, start, end)
+    brute_s = (time.perf_counter() - t0) * len(windows) / max(1, args.check)
+
+    t0 = time.perf_counter()
+    for car_id, start, end in ((rng.randint(1, args.cars), s, e) for s, e in windows):
+        index.is_free(car_id, start, end)
+    single_s = time.perf_counter() - t0
+
+    print(f"rentals={args.rentals} cars={args.cars} queries={args.queries}")
+    print(f"build            {build_s * 1000:9.1f} ms")
+    print(f"busy_cars/query  {index_s / len(windows) * 1000:9.3f} ms (index)")
+    print(f"busy_cars/query  {brute_s / len(windows) * 1000:9.3f} ms (full scan)")
+    print(f"is_free/query    {single_s / len(windows) * 1e6:9.2f} us")
+
+
+if __name__ == "__main__":
+    main()
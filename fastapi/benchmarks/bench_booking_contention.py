@@ -0,0 +1,102 @@
+"""Booking contention benchmark.
+
+Many concurrent POST /rentals against a handful of cars over a short
+horizon, so most requests collide. Reports throughput, outcome split and
+checks that no two blocking rentals of a car overlap.
+
+    python -m benchmarks.bench_booking_contention --cars 5 --bookings 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import collections
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import configure_environment
+
+configure_environment()
+
+import httpx
+from sqlalchemy import text
+
+from api.database import Base, engine
+from api.main import create_app
+from api.models import Car
+from api.routers.auth import create_access_token
+
+app = create_app()
+
+OVERLAPS = text("""
+    SELECT COUNT(*) FROM rentals a JOIN rentals b
+      ON a.car_id = b.car_id AND a.id < b.id
+     AND a.status IN ('pending', 'confirmed') AND b.status IN ('pending', 'confirmed')
+     AND a.start_date < b.end_date AND b.start_date < a.end_date
+""")
+
+
+def seed(cars: int):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(Car.__table__.insert(), [
+            {"plate_number": f"BOOK-{i}", "brand": "b", "model": "m", "rental_price_per_day": 40}
+            for i in range(cars)
+        ])
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    origin = date(2030, 1, 1)
+    token = create_access_token("bench", 1, timedelta(hours=1))
+    headers = {"Authorization": f"Bearer {token}"}
+    outcomes = collections.Counter()
+    sem = asyncio.Semaphore(args.concurrency)
+
+    async def book(client):
+        start = origin + timedelta(days=rng.randrange(args.horizon))
+        body = {
+            "car_id": rng.randint(1, args.cars),
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=rng.randint(1, 7))).isoformat(),
+        }
+        async with sem:
+            r = await client.post("/rentals/", json=body, headers=headers)
+        if r.status_code == 201:
+            outcomes["booked"] += 1
+        elif r.status_code == 409:
+            outcomes[r.json()["detail"]] += 1
+        else:
+            outcomes[f"HTTP {r.status_code}"] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(book(client) for _ in range(args.bookings)))
+        elapsed = time.perf_counter() - t0
+
+    with engine.connect() as conn:
+        double_bookings = conn.execute(OVERLAPS).scalar()
+
+    print(f"cars={args.cars} bookings={args.bookings} concurrency={args.concurrency}")
+    print(f"throughput       {args.bookings / elapsed:8.1f} req/s")
+    for outcome, count in outcomes.most_common():
+        print(f"{outcome:40} {count:6d} ({count / args.bookings:6.1%})")
+    print(f"double bookings  {double_bookings}")
+    assert double_bookings == 0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cars", type=int, default=5)
+    parser.add_argument("--bookings", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--horizon", type=int, default=120, help="days")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    seed(args.cars)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Sync vs async database mode benchmark.
+
+Runs the same mixed read/write workload against the app once per
+DB_MODE, each in a fresh process on its own temporary SQLite file.
+
+    python -m benchmarks.bench_db_modes --cars 5000 --requests 2000 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def seed(cars: int):
+    from api.database import Base, engine
+    from api.models import Car
+
+    Base.metadata.create_all(bind=engine)
+    rows = [
+        {
+            "plate_number": f"BENCH-{i:07d}",
+            "brand": f"brand-{i % 20}",
+            "model": f"model-{i % 50}",
+            "mileage": i * 7 % 200_000,
+            "rental_price_per_day": 20 + i % 80,
+        }
+        for i in range(cars)
+    ]
+    with engine.begin() as conn:
+        conn.execute(Car.__table__.insert(), rows)
+
+
+async def workload(args):
+    import httpx
+    from api.main import create_app
+
+    app = create_app()
+
+    rng = random.Random(args.seed)
+    latencies = {"read": [], "write": []}
+    sem = asyncio.Semaphore(args.concurrency)
+
+    async def one(client):
+        async with sem:
+            car_id = rng.randint(1, args.cars)
+            if rng.random() < args.write_ratio:
+                kind = "write"
+                call = client.put(f"/cars/{car_id}", json={"mileage": rng.randint(0, 300_000)})
+            else:
+                kind = "read"
+                if rng.random() < 0.5:
+                    call = client.get("/cars/", params={"limit": 50, "sort_by": "rental_price_per_day"})
+                else:
+                    call = client.get(f"/cars/{car_id}")
+            t0 = time.perf_counter()
+            r = await call
+            latencies[kind].append((time.perf_counter() - t0) * 1000)
+            assert r.status_code == 200, r.text
+
+    # ASGITransport ne déclenche pas le lifespan : lancé ici
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), \
+            httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one(client) for _ in range(args.requests)))
+        elapsed = time.perf_counter() - t0
+
+    result = {"mode": os.environ["DB_MODE"], "rps": args.requests / elapsed}
+    for kind, samples in latencies.items():
+        if samples:
+            result[kind] = {
+                "n": len(samples),
+                "p50": statistics.median(samples),
+                "p99": percentile(samples, 99),
+            }
+    return result
+
+
+def run_child(args):
+    seed(args.cars)
+    print(json.dumps(asyncio.run(workload(args))))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cars", type=int, default=5_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    for mode in ("sync", "async"):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(
+                os.environ,
+                DB_MODE=mode,
+                LIFECYCLE_ENABLED="0",
+                DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                PYTHONPATH=ROOT,
+            )
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_db_modes", "--child", *sys.argv[1:]],
+                cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+
+        line = f"{mode:5}  {result['rps']:8.1f} req/s"
+        for kind in ("read", "write"):
+            if kind in result:
+                r = result[kind]
+                line += f"  {kind} p50={r['p50']:6.2f} ms p99={r['p99']:7.2f} ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Group commit benchmark: write throughput with and without GROUP_COMMIT.
+
+Fires concurrent POST /cars and PUT /cars/{id} requests (a share of them
+duplicate plates, answered 409) at the app, once per GROUP_COMMIT and
+SQLite synchronous setting, each in a fresh process on its own temporary
+database. Reports writes/s, latency and the number of SQL COMMITs.
+
+    python -m benchmarks.bench_group_commit --writes 3000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def workload(args):
+    import httpx
+    from sqlalchemy import event
+    from api.database import engine
+    from api.main import create_app
+    from api.settings import get_settings
+
+    app = create_app()
+
+    commits = 0
+
+    def count_commit(conn):
+        nonlocal commits
+        commits += 1
+
+    rng = random.Random(args.seed)
+    latencies = []
+    statuses = {}
+    sem = asyncio.Semaphore(args.concurrency)
+    created = []
+
+    async def one(client, i):
+        async with sem:
+            if created and rng.random() < args.update_ratio:
+                call = client.put(f"/cars/{rng.choice(created)}", json={"mileage": rng.randint(0, 300_000)})
+            else:
+                # Une partie des plaques revient : 409 attendu
+                plate = f"GC-{rng.randint(0, int(args.writes * (1 - args.duplicate_ratio)))}"
+                call = client.post("/cars/", json={
+                    "plate_number": plate, "brand": "bench", "model": "gc", "rental_price_per_day": 30,
+                })
+            t0 = time.perf_counter()
+            r = await call
+            latencies.append((time.perf_counter() - t0) * 1000)
+            statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+            if r.status_code == 201:
+                created.append(r.json()["id"])
+
+    # ASGITransport ne déclenche pas le lifespan : lancé ici (schéma
+    # compris, d'où l'écoute des COMMIT après le démarrage)
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), \
+            httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        event.listen(engine, "commit", count_commit)
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one(client, i) for i in range(args.writes)))
+        elapsed = time.perf_counter() - t0
+
+    return {
+        "group_commit": get_settings().group_commit,
+        "synchronous": os.environ["SQLITE_SYNCHRONOUS"],
+        "writes_per_s": args.writes / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": percentile(latencies, 99),
+        "commits": commits,
+        "statuses": statuses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writes", type=int, default=3_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--update-ratio", type=float, default=0.3)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1)
+    parser.add_argument("--synchronous", nargs="+", default=["NORMAL", "FULL"])
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(workload(args))))
+        return
+
+    for synchronous in args.synchronous:
+        for group_commit in ("0", "1"):
+            with tempfile.TemporaryDirectory() as tmp:
+                env = dict(
+                    os.environ,
+                    GROUP_COMMIT=group_commit,
+                    GROUP_COMMIT_WINDOW_MS=str(args.window_ms),
+                    SQLITE_SYNCHRONOUS=synchronous,
+                    LIFECYCLE_ENABLED="0",
+                    DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                    AUTH_SECRET_KEY="benchmark-secret",
+                    AUTH_ALGORITHM="HS256",
+                    PYTHONPATH=ROOT,
+                )
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_group_commit", "--child", *sys.argv[1:]],
+                    cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+                )
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+
+            label = "group" if r["group_commit"] else "single"
+            print(
+                f"synchronous={synchronous:6} {label:6}  {r['writes_per_s']:8.1f} writes/s"
+                f"  p50={r['p50']:7.2f} ms p99={r['p99']:8.2f} ms"
+                f"  commits={r['commits']:5}  statuses={r['statuses']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
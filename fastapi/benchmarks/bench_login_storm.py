@@ -0,0 +1,115 @@
+"""Login storm benchmark.
+
+Fires concurrent ``/auth/admin/token`` logins while probing the health
+check, and reports probe latency with and without the storm. With bcrypt
+on the event loop the probe p99 tracks the hash time; off the loop it
+stays near the idle baseline. The per-IP / per-username buckets are
+lifted so the storm reaches the verification cap; attempts over the cap
+are answered 429 and counted as shed.
+
+    AUTH_BCRYPT_ROUNDS=12 python -m benchmarks.bench_login_storm --logins 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.common import configure_environment, percentile
+
+configure_environment()
+# Un seul client, un seul compte : seul le plafond de vérifications joue
+os.environ.setdefault("AUTH_RATE_IP_BURST", "1000000")
+os.environ.setdefault("AUTH_RATE_USER_BURST", "1000000")
+
+import httpx
+
+from api.database import Base, SessionLocal, engine
+from api.deps import bcrypt_context
+from api.main import create_app
+from api.models import Admin
+from api.ratelimit import verification_slots
+from api.settings import get_settings
+
+app = create_app()
+
+
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    db.add(Admin(username="bench", email="bench@example.com",
+                 hashed_password=bcrypt_context.hash("secret")))
+    db.commit()
+    db.close()
+
+
+async def probe(client, stop, samples, interval):
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await client.get("/")
+        samples.append((time.perf_counter() - t0) * 1000)
+        await asyncio.sleep(interval)
+
+
+async def storm(client, logins, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+    statuses = {}
+
+    async def login():
+        async with sem:
+            r = await client.post("/auth/admin/token",
+                                  data={"username": "bench", "password": "secret"})
+            assert r.status_code in (200, 429), r.text
+            statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return statuses
+
+
+async def run(args):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        idle, loaded = [], []
+
+        stop = asyncio.Event()
+        task = asyncio.create_task(probe(client, stop, idle, args.interval))
+        await asyncio.sleep(args.idle_seconds)
+        stop.set()
+        await task
+
+        stop = asyncio.Event()
+        task = asyncio.create_task(probe(client, stop, loaded, args.interval))
+        t0 = time.perf_counter()
+        statuses = await storm(client, args.logins, args.concurrency)
+        elapsed = time.perf_counter() - t0
+        stop.set()
+        await task
+
+    settings = get_settings()
+    print(f"bcrypt rounds={settings.auth_bcrypt_rounds} hash workers={settings.auth_hash_workers} "
+          f"verification cap={verification_slots.limit}")
+    print(f"logins={args.logins} concurrency={args.concurrency} "
+          f"-> {args.logins / elapsed:.1f} attempts/s, "
+          f"served={statuses.get(200, 0)} shed={statuses.get(429, 0)}")
+    for name, samples in (("idle", idle), ("storm", loaded)):
+        print(f"GET / {name:5}  n={len(samples):5}  "
+              f"p50={statistics.median(samples):7.2f} ms  "
+              f"p99={percentile(samples, 99):7.2f} ms  "
+              f"max={max(samples):7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--interval", type=float, default=0.005)
+    parser.add_argument("--idle-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    setup_database()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
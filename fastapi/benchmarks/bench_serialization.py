@@ -0,0 +1,157 @@
+"""Car listing serialization: ORM + Pydantic path vs column rows + orjson.
+
+For each fleet size, times a full paginated walk of GET /cars pages
+(``limit=500``) and a single unpaginated listing, through both the
+previous path (Car instances validated into CarPage) and the row path
+now used by the route. Also reports gzip / br cost and ratio on the
+largest body. Same JSON and baseline options as ``benchmarks.load``.
+
+    python -m benchmarks.bench_serialization --sizes 10000 100000
+"""
+import argparse
+import itertools
+import random
+import sys
+import time
+
+from benchmarks.common import (
+    add_output_arguments,
+    configure_environment,
+    environment_info,
+    finish,
+    summarize,
+)
+
+PAGE_SIZE = 500
+
+
+def walk(db, listing_for, fetch, serialize):
+    """Every page of the id-sorted listing; returns the bytes produced."""
+    total = 0
+    cursor = None
+    while True:
+        listing = listing_for(cursor)
+        body, cursor = serialize(listing, fetch(db, listing))
+        total += len(body)
+        if cursor is None:
+            return total
+
+
+def cases(db):
+    from api import serialization
+    from api.routers.cars import CarPage, CarResponse, car_listing
+
+    def listing_for(cursor, limit=PAGE_SIZE):
+        return car_listing(None, None, None, None, None, None, None, "id", "asc", limit, cursor)
+
+    def orm_fetch(db, listing):
+        return db.scalars(listing.statement).all()
+
+    def orm_serialize(listing, cars):
+        page = CarPage.model_validate(listing.page(cars))
+        return page.model_dump_json().encode(), page.next_cursor
+
+    def rows_fetch(db, listing):
+        return db.execute(listing.row_statement).all()
+
+    def rows_serialize(listing, rows):
+        page = listing.page(rows)
+        cursor = page["next_cursor"]
+        page["items"] = serialization.rows_as_dicts(page["items"])
+        return serialization.dumps(page), cursor
+
+    def orm_all():
+        db.expunge_all()
+        cars = db.scalars(listing_for(None).statement.limit(None)).all()
+        return b"[" + b",".join(CarResponse.model_validate(c).model_dump_json().encode() for c in cars) + b"]"
+
+    def rows_all():
+        rows = db.execute(listing_for(None).row_statement.limit(None)).all()
+        return serialization.dumps(serialization.rows_as_dicts(rows))
+
+    def orm_walk():
+        db.expunge_all()
+        return walk(db, listing_for, orm_fetch, orm_serialize)
+
+    return {
+        "orm.pages": orm_walk,
+        "rows.pages": lambda: walk(db, listing_for, rows_fetch, rows_serialize),
+        "orm.all": orm_all,
+        "rows.all": rows_all,
+    }
+
+
+def timed(fn, repeats: int):
+    samples = []
+    result = None
+    t_total = 0.0
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        t_total += elapsed
+        samples.append(elapsed * 1000)
+    return summarize(samples, t_total), result
+
+
+def grow(engine, target: int, rng):
+    """Top the cars table up to ``target`` rows (plates continue the sequence)."""
+    from sqlalchemy import func, select
+
+    from benchmarks.seed import car_rows, insert_chunks
+    from api.models import Car
+
+    with engine.connect() as conn:
+        current = conn.execute(select(func.count()).select_from(Car)).scalar()
+    if target > current:
+        insert_chunks(engine, Car.__table__, itertools.islice(car_rows(target, rng), current, None))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    add_output_arguments(parser)
+    args = parser.parse_args()
+
+    configure_environment()
+
+    from api import serialization
+    from api.database import Base, SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(args.seed)
+
+    results = {}
+    for size in sorted(args.sizes):
+        grow(engine, size, rng)
+        db = SessionLocal()
+        try:
+            bodies = {}
+            for name, fn in cases(db).items():
+                fn()
+                r, bodies[name] = timed(fn, args.repeats)
+                results[f"{name}_{size}"] = r
+                print(f"{size:>7} cars  {name:12} p50={r['p50']:9.1f} ms  p99={r['p99']:9.1f} ms")
+        finally:
+            db.close()
+
+        body = bodies["rows.all"]
+        for encoding in ("gzip", "br"):
+            if encoding == "br" and serialization.brotli is None:
+                continue
+            r, compressed = timed(lambda: serialization.compress(body, encoding), args.repeats)
+            results[f"{encoding}.all_{size}"] = r
+            print(f"{size:>7} cars  {encoding:12} p50={r['p50']:9.1f} ms  "
+                  f"{len(body) / 1e6:6.2f} MB -> {len(compressed) / 1e6:6.2f} MB")
+
+    sys.exit(finish({
+        "config": {"sizes": args.sizes, "repeats": args.repeats, "page_size": PAGE_SIZE},
+        "environment": environment_info(),
+        "benchmarks": results,
+    }, args))
+
+
+if __name__ == "__main__":
+    main()
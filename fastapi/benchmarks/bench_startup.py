@@ -0,0 +1,118 @@
+"""Startup benchmark: cold boot to first served request.
+
+Each run is a fresh interpreter that imports ``api.main``, builds the
+app with ``create_app()`` (counted in "import"), runs its lifespan
+(engine, schema, pool warm-up) and serves ``GET /cars/``. Times are
+taken from the moment the process is spawned, so interpreter start is
+included. Cases: a new database file, a restart on an existing one,
+and a restart with ``CREATE_SCHEMA=0``.
+
+    python -m benchmarks.bench_startup --runs 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import add_output_arguments, environment_info, finish, percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = (
+    # (nom, base neuve, CREATE_SCHEMA)
+    ("new_db", True, "1"),
+    ("restart", False, "1"),
+    ("restart_no_schema", False, "0"),
+)
+
+
+async def boot():
+    spawned = float(os.environ["BENCH_SPAWNED_AT"])
+    t0 = time.time()
+
+    import httpx
+    from api.main import create_app
+    app = create_app()
+    t_import = time.time()
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), \
+            httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        t_startup = time.time()
+        r = await client.get("/cars/", params={"limit": 10})
+        t_first = time.time()
+        assert r.status_code == 200, r.text
+
+    return {
+        "interpreter": (t0 - spawned) * 1000,
+        "import": (t_import - t0) * 1000,
+        "startup": (t_startup - t_import) * 1000,
+        "first_request": (t_first - t_startup) * 1000,
+        "total": (t_first - spawned) * 1000,
+        "numpy_loaded": "numpy" in sys.modules,
+    }
+
+
+def run_case(path: str, create_schema: str) -> dict:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{path}",
+        CREATE_SCHEMA=create_schema,
+        LIFECYCLE_ENABLED="0",
+        AUTH_SECRET_KEY="benchmark-secret",
+        AUTH_ALGORITHM="HS256",
+        PYTHONPATH=ROOT,
+        BENCH_SPAWNED_AT=repr(time.time()),
+    )
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child"],
+        cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    add_output_arguments(parser)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(boot())))
+        return
+
+    phases = ("interpreter", "import", "startup", "first_request", "total")
+    results = {}
+    for name, new_db, create_schema in CASES:
+        runs = []
+        for _ in range(args.runs):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "bench.db")
+                if not new_db:
+                    # Schéma (et index de recherche) créés par un premier démarrage
+                    run_case(path, "1")
+                runs.append(run_case(path, create_schema))
+
+        # p50 / p95 par phase : comparables à une baseline (--baseline)
+        for phase in phases:
+            samples = [r[phase] for r in runs]
+            results[f"{name}.{phase}"] = {"p50": statistics.median(samples), "p95": percentile(samples, 95)}
+        numpy_loaded = any(r["numpy_loaded"] for r in runs)
+        print(f"{name:18} " + "  ".join(f"{phase}={results[f'{name}.{phase}']['p50']:7.1f}" for phase in phases)
+              + f" ms  numpy={numpy_loaded}")
+
+    sys.exit(finish({
+        "config": {"runs": args.runs},
+        "environment": environment_info(),
+        "benchmarks": results,
+    }, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Shared helpers for the benchmark scripts.
+
+``configure_environment`` must run before anything under ``api`` is
+imported: the settings are read once, on first use, and the remaining
+tunables at import time.
+"""
+import atexit
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+
+
+def configure_environment(database_dir: str | None = None) -> str:
+    """Point the app at a fresh SQLite file and set dummy auth settings."""
+    if database_dir is None:
+        database_dir = tempfile.mkdtemp(prefix="rental-bench-")
+        atexit.register(shutil.rmtree, database_dir, ignore_errors=True)
+    path = os.path.join(database_dir, "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("AUTH_SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("AUTH_ALGORITHM", "HS256")
+    # Pas de tâches de fond pendant les mesures
+    os.environ.setdefault("LIFECYCLE_ENABLED", "0")
+    return path
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def summarize(latencies_ms, elapsed_s: float) -> dict:
+    return {
+        "requests": len(latencies_ms),
+        "throughput": len(latencies_ms) / elapsed_s if elapsed_s else 0.0,
+        "p50": statistics.median(latencies_ms),
+        "p95": percentile(latencies_ms, 95),
+        "p99": percentile(latencies_ms, 99),
+    }
+
+
+def environment_info() -> dict:
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def write_results(path: str, results: dict):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Per-benchmark deltas against a baseline; flags regressions past ``threshold``.
+
+    Latencies regress when they grow, throughput when it shrinks.
+    """
+    rows = []
+    for name, current in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if previous is None:
+            continue
+        for metric in ("throughput", "p50", "p95", "p99"):
+            if metric not in current or metric not in previous or not previous[metric]:
+                continue
+            delta = (current[metric] - previous[metric]) / previous[metric]
+            worse = -delta if metric == "throughput" else delta
+            rows.append({
+                "benchmark": name,
+                "metric": metric,
+                "baseline": previous[metric],
+                "current": current[metric],
+                "delta": delta,
+                "regression": worse > threshold,
+            })
+    return rows
+
+
+def print_comparison(rows: list):
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"{row['benchmark']:32} {row['metric']:10} "
+              f"{row['baseline']:10.3f} -> {row['current']:10.3f} "
+              f"({row['delta']:+7.1%}) {flag}")
+
+
+def add_output_arguments(parser):
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a saved results file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative change counted as a regression (default 10%%)")
+
+
+def finish(results: dict, args) -> int:
+    """Save and compare results; returns the process exit code."""
+    if args.out:
+        write_results(args.out, results)
+        print(f"results written to {args.out}")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline, args.threshold)
+    print()
+    print_comparison(rows)
+    return 1 if any(row["regression"] for row in rows) else 0
@@ -0,0 +1,138 @@
+"""In-process load test of the API.
+
+Seeds a temporary SQLite database, drives the ASGI app through an async
+HTTP client at a fixed concurrency and reports per-endpoint throughput
+and p50/p95/p99 latency. Results can be saved to JSON and compared with
+a previous run; the exit code is 1 when a metric regressed.
+
+    python -m benchmarks.load --cars 10000 --rentals 100000 --out base.json
+    python -m benchmarks.load --cars 10000 --rentals 100000 --baseline base.json
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import (
+    add_output_arguments,
+    configure_environment,
+    environment_info,
+    finish,
+    summarize,
+)
+
+
+def scenarios(args, rng: random.Random, token: str):
+    """name -> function building (method, url, kwargs) for one request."""
+    from benchmarks.seed import BRANDS
+
+    auth = {"headers": {"Authorization": f"Bearer {token}"}}
+    today = date.today()
+
+    def window():
+        start = today + timedelta(days=rng.randrange(-30, 60))
+        return {"start_date": start.isoformat(), "end_date": (start + timedelta(days=7)).isoformat()}
+
+    return {
+        "health": lambda: ("GET", "/", {}),
+        "cars.list": lambda: ("GET", "/cars/", {"params": {
+            "limit": 50,
+            "sort_by": rng.choice(["id", "rental_price_per_day", "mileage"]),
+            "min_price": rng.randrange(25, 200),
+        }}),
+        "cars.filtered": lambda: ("GET", "/cars/", {"params": {
+            "brand": rng.choice(BRANDS),
+            "status": "available",
+            "max_mileage": rng.randrange(10_000, 250_000),
+        }}),
+        "cars.get": lambda: ("GET", f"/cars/{rng.randint(1, args.cars)}", {}),
+        "rentals.availability": lambda: ("GET", "/rentals/availability", {"params": window()}),
+        "admin.revenue": lambda: ("GET", "/admin/analytics/revenue", {
+            "params": {"group_by": rng.choice(["car", "brand", "month"])}, **auth,
+        }),
+    }
+
+
+async def run_scenario(client, build, requests: int, concurrency: int):
+    latencies = []
+    sem = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        method, url, kwargs = build()
+        async with sem:
+            t0 = time.perf_counter()
+            r = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        if r.status_code >= 400:
+            errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    result = summarize(latencies, time.perf_counter() - t0)
+    result["errors"] = errors
+    return result
+
+
+async def run(args):
+    import httpx
+    from api.main import create_app
+    from api.routers.auth import create_access_token
+    from benchmarks.seed import BENCH_ADMIN
+
+    app = create_app()
+
+    rng = random.Random(args.seed)
+    token = create_access_token(BENCH_ADMIN["username"], BENCH_ADMIN["id"], timedelta(hours=1), "admin")
+    selected = scenarios(args, rng, token)
+    if args.scenarios:
+        selected = {name: selected[name] for name in args.scenarios}
+
+    results = {}
+    # ASGITransport ne déclenche pas le lifespan : lancé ici
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), \
+            httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name, build in selected.items():
+            await run_scenario(client, build, args.warmup, args.concurrency)
+            results[name] = await run_scenario(client, build, args.requests, args.concurrency)
+            r = results[name]
+            print(f"{name:24} {r['throughput']:9.1f} req/s  p50={r['p50']:8.2f}  "
+                  f"p95={r['p95']:8.2f}  p99={r['p99']:8.2f} ms  errors={r['errors']}")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cars", type=int, default=10_000)
+    parser.add_argument("--rentals", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=1_000, help="per endpoint")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--scenarios", nargs="*", help="subset of endpoints to run")
+    parser.add_argument("--seed", type=int, default=42)
+    add_output_arguments(parser)
+    args = parser.parse_args()
+
+    configure_environment()
+    from api.database import engine
+    from benchmarks.seed import seed
+
+    t0 = time.perf_counter()
+    seed(engine, args.cars, args.rentals, args.seed)
+    print(f"seeded {args.cars} cars / {args.rentals} rentals in {time.perf_counter() - t0:.1f}s")
+
+    results = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "baseline")},
+        "environment": environment_info(),
+        "benchmarks": asyncio.run(run(args)),
+    }
+    sys.exit(finish(results, args))
+
+
+if __name__ == "__main__":
+    main()
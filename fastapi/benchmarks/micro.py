@@ -0,0 +1,113 @@
+"""Micro-benchmarks of hot helpers, without HTTP or a populated database.
+
+Each case runs in batches; the reported percentiles are per-call times
+(in ms) across batches, throughput is calls per second. Same JSON and
+baseline options as ``benchmarks.load``.
+
+    python -m benchmarks.micro --out micro.json
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import date, timedelta
+
+from benchmarks.common import (
+    add_output_arguments,
+    configure_environment,
+    environment_info,
+    finish,
+    summarize,
+)
+
+
+def cases():
+    from jose import jwt
+
+    from api.availability import AvailabilityIndex
+    from api.deps import get_current_user, token_cache
+    from api.models import CarStatusEnum
+    from api.routers.auth import create_access_token
+    from api.routers.cars import CarPage, decode_cursor, encode_cursor
+    from api.settings import get_settings
+
+    settings = get_settings()
+    token = create_access_token("bench", 1, timedelta(hours=1))
+    # Remplit le cache pour le cas "hit"
+    asyncio.run(get_current_user(token))
+
+    page = {
+        "items": [
+            {
+                "id": i,
+                "plate_number": f"{i:06d}-TU",
+                "brand": "Renault",
+                "model": "Clio",
+                "mileage": i * 13,
+                "status": CarStatusEnum.available,
+                "rental_price_per_day": 42.0,
+            }
+            for i in range(50)
+        ],
+        "next_cursor": encode_cursor(42.0, 50),
+    }
+
+    index = AvailabilityIndex()
+    origin = date(2030, 1, 1)
+    for rental_id in range(10_000):
+        start = origin + timedelta(days=(rental_id * 7) % 3650)
+        index._add(rental_id, rental_id % 500, start, start + timedelta(days=5))
+    index.loaded = True
+
+    return {
+        "jwt.decode": lambda: jwt.decode(token, settings.auth_secret_key, algorithms=[settings.auth_algorithm]),
+        "token_cache.hit": lambda: token_cache.get(token),
+        "cursor.roundtrip": lambda: decode_cursor(encode_cursor(42.0, 1234)),
+        "car_page.serialize_50": lambda: CarPage.model_validate(page).model_dump_json(),
+        "availability.is_free": lambda: index.is_free(7, origin, origin + timedelta(days=3)),
+        "availability.busy_cars": lambda: index.busy_cars(origin, origin + timedelta(days=3)),
+    }
+
+
+def measure(fn, batches: int, batch_size: int):
+    per_call = []
+    t_total = 0.0
+    for _ in range(batches):
+        t0 = time.perf_counter()
+        for _ in range(batch_size):
+            fn()
+        elapsed = time.perf_counter() - t0
+        t_total += elapsed
+        per_call.append(elapsed / batch_size * 1000)
+
+    result = summarize(per_call, t_total)
+    result["throughput"] = batches * batch_size / t_total
+    result["requests"] = batches * batch_size
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batches", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=200)
+    add_output_arguments(parser)
+    args = parser.parse_args()
+
+    configure_environment()
+
+    results = {}
+    for name, fn in cases().items():
+        fn()
+        results[name] = r = measure(fn, args.batches, args.batch_size)
+        print(f"{name:26} {r['throughput']:12.0f} calls/s  p50={r['p50'] * 1000:9.2f} us  "
+              f"p99={r['p99'] * 1000:9.2f} us")
+
+    sys.exit(finish({
+        "config": {"batches": args.batches, "batch_size": args.batch_size},
+        "environment": environment_info(),
+        "benchmarks": results,
+    }, args))
+
+
+if __name__ == "__main__":
+    main()
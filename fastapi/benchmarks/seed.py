@@ -0,0 +1,107 @@
+"""Synthetic fleet and rental history for the benchmarks.
+
+    python -m benchmarks.seed --cars 10000 --rentals 1000000 --database /tmp/bench.db
+"""
+import argparse
+import os
+import random
+import time
+from datetime import date, timedelta
+
+BRANDS = ["Renault", "Peugeot", "Citroen", "Dacia", "Toyota", "VW", "Ford", "Fiat", "Kia", "BMW"]
+MODELS = [f"model-{i}" for i in range(40)]
+
+CHUNK = 10_000
+
+
+def car_rows(cars: int, rng: random.Random):
+    from api.models import CarStatusEnum
+
+    statuses = [CarStatusEnum.available] * 8 + [CarStatusEnum.rented, CarStatusEnum.maintenance]
+    for i in range(cars):
+        yield {
+            "plate_number": f"{i:06d}-TU-{i % 250:03d}",
+            "brand": rng.choice(BRANDS),
+            "model": rng.choice(MODELS),
+            "mileage": rng.randrange(0, 250_000),
+            "status": rng.choice(statuses),
+            "rental_price_per_day": float(rng.randrange(25, 200)),
+            "version": 0,
+        }
+
+
+def rental_rows(rentals: int, cars: int, rng: random.Random, today: date):
+    from api.models import RentalStatusEnum
+
+    # Historique sur cinq ans, l'essentiel terminé
+    for _ in range(rentals):
+        start = today - timedelta(days=rng.randrange(-60, 5 * 365))
+        days = rng.randint(1, 21)
+        end = start + timedelta(days=days)
+        if end < today:
+            status = RentalStatusEnum.cancelled if rng.random() < 0.08 else RentalStatusEnum.finished
+        else:
+            status = rng.choice([RentalStatusEnum.pending, RentalStatusEnum.confirmed])
+        price = float(rng.randrange(25, 200))
+        yield {
+            "car_id": rng.randint(1, cars),
+            "start_date": start,
+            "end_date": end,
+            "price_per_day": price,
+            "total_price": price * days,
+            "status": status,
+            "summarized": False,
+        }
+
+
+def insert_chunks(engine, table, rows):
+    batch = []
+    with engine.begin() as conn:
+        for row in rows:
+            batch.append(row)
+            if len(batch) == CHUNK:
+                conn.execute(table.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(table.insert(), batch)
+
+
+# Compte admin des benchmarks (routes /admin)
+BENCH_ADMIN = {"id": 1, "username": "bench", "email": "bench@example.com", "hashed_password": "unused"}
+
+
+def seed(engine, cars: int, rentals: int, seed: int = 42, today: date | None = None):
+    """Create the schema and insert ``cars`` cars, ``rentals`` rentals and
+    the BENCH_ADMIN account."""
+    from api.database import Base
+    from api.models import Admin, Car, Rental
+
+    rng = random.Random(seed)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(Admin.__table__.insert().prefix_with("OR IGNORE"), BENCH_ADMIN)
+    insert_chunks(engine, Car.__table__, car_rows(cars, rng))
+    if rentals and cars:
+        insert_chunks(engine, Rental.__table__, rental_rows(rentals, cars, rng, today or date.today()))
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cars", type=int, default=10_000)
+    parser.add_argument("--rentals", type=int, default=100_000)
+    parser.add_argument("--database", required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{args.database}"
+    from api.database import engine
+
+    t0 = time.perf_counter()
+    seed(engine, args.cars, args.rentals, args.seed)
+    print(f"seeded {args.cars} cars, {args.rentals} rentals in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
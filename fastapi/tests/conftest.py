@@ -0,0 +1,77 @@
+import os
+
+# Avant tout import de l'API : réglages lus une seule fois
+os.environ.setdefault("AUTH_SECRET_KEY", "test-secret")
+os.environ.setdefault("AUTH_ALGORITHM", "HS256")
+os.environ.setdefault("LIFECYCLE_ENABLED", "0")
+
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import database
+from api.availability import availability_index
+from api.deps import token_cache
+from api.main import create_app
+from api.models import Admin
+from api.response_cache import cars_cache
+from api.routers.auth import create_access_token
+from api.settings import Settings
+
+
+@pytest.fixture
+def settings(tmp_path):
+    return Settings(
+        database_url=f"sqlite:///{tmp_path / 'test.db'}",
+        auth_secret_key="test-secret",
+        auth_algorithm="HS256",
+        lifecycle_enabled=False,
+    )
+
+
+@pytest.fixture
+def client(settings):
+    # Caches du processus : rien ne doit venir du test précédent
+    cars_cache.bump()
+    token_cache.clear()
+    availability_index.clear()
+    with TestClient(create_app(settings)) as client:
+        yield client
+
+
+@pytest.fixture
+def db(client):
+    session = database.SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def admin(db):
+    admin = Admin(username="boss", email="boss@example.com", hashed_password="unused")
+    db.add(admin)
+    db.commit()
+    return admin
+
+
+def bearer(username: str, user_id: int, role: str = "renter") -> dict:
+    token = create_access_token(username, user_id, timedelta(minutes=5), role)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def token_headers():
+    """``token_headers(username, user_id, role="renter")``: Authorization
+    headers for a token issued to that user."""
+    return bearer
+
+
+@pytest.fixture
+def admin_headers(admin):
+    return bearer(admin.username, admin.id, "admin")
+
+
+@pytest.fixture
+def renter_headers():
+    return bearer("u", 1)
@@ -0,0 +1,47 @@
+"""/admin routes require a token issued to an existing admin."""
+import pytest
+
+
+ADMIN_ROUTES = [
+    ("GET", "/admin/analytics/revenue", {}),
+    ("GET", "/admin/analytics/utilization", {"start_date": "2030-01-01", "end_date": "2030-02-01"}),
+    ("POST", "/admin/analytics/summary/refresh", {}),
+    ("POST", "/admin/lifecycle/run", {}),
+    ("GET", "/admin/lifecycle", {}),
+    ("POST", "/admin/archive/run", {"vacuum": "incremental"}),
+]
+
+
+@pytest.mark.parametrize("method,path,params", ADMIN_ROUTES)
+def test_renter_token_is_forbidden(client, admin, renter_headers, method, path, params):
+    r = client.request(method, path, params=params, headers=renter_headers)
+    assert r.status_code == 403
+
+
+@pytest.mark.parametrize("method,path,params", ADMIN_ROUTES)
+def test_anonymous_is_unauthorized(client, method, path, params):
+    assert client.request(method, path, params=params).status_code == 401
+
+
+@pytest.mark.parametrize("method,path,params", ADMIN_ROUTES)
+def test_admin_token_is_allowed(client, admin_headers, method, path, params):
+    assert client.request(method, path, params=params, headers=admin_headers).status_code == 200
+
+
+def test_role_claim_alone_is_not_enough(client, admin, token_headers):
+    # Bon rôle, mais aucun admin de ce nom / id
+    forged = token_headers("mallory", admin.id, "admin")
+    r = client.get("/admin/analytics/revenue", headers=forged)
+    assert r.status_code == 403
+
+
+def test_deleted_admin_loses_access(client, db, admin, admin_headers):
+    assert client.get("/admin/analytics/revenue", headers=admin_headers).status_code == 200
+    db.delete(admin)
+    db.commit()
+    assert client.get("/admin/analytics/revenue", headers=admin_headers).status_code == 403
+
+
+def test_full_vacuum_is_not_exposed(client, admin_headers):
+    r = client.post("/admin/archive/run", params={"vacuum": "full"}, headers=admin_headers)
+    assert r.status_code == 422
@@ -0,0 +1,63 @@
+"""Summary refresh folds each finished rental exactly once."""
+from datetime import date, timedelta
+import threading
+
+from sqlalchemy import func, select
+
+from api import analytics, database
+from api.models import Car, Rental, RentalStatusEnum, RentalSummary
+
+
+def seed_finished(rentals: int, price: float):
+    with database.engine.begin() as conn:
+        conn.execute(Car.__table__.insert(), [
+            {"plate_number": f"AN-{i}", "brand": "b", "model": "m", "rental_price_per_day": 10}
+            for i in range(10)
+        ])
+        conn.execute(Rental.__table__.insert(), [
+            {
+                "car_id": i % 10 + 1,
+                "start_date": date(2030, 1, 1) + timedelta(days=i % 300),
+                "end_date": date(2030, 1, 3) + timedelta(days=i % 300),
+                "total_price": price,
+                "status": RentalStatusEnum.finished,
+            }
+            for i in range(rentals)
+        ])
+
+
+def summary_totals(db):
+    return db.execute(select(func.sum(RentalSummary.rentals), func.sum(RentalSummary.revenue))).one()
+
+
+def test_refresh_is_idempotent(client, db):
+    seed_finished(50, 20.0)
+    assert analytics.refresh_summary(db, batch_size=7) == 50
+    assert analytics.refresh_summary(db, batch_size=7) == 0
+    assert tuple(summary_totals(db)) == (50, 1000.0)
+
+
+def test_overlapping_refreshes_fold_once(client, db):
+    seed_finished(2000, 10.0)
+    barrier = threading.Barrier(2)
+    folded, errors = [], []
+
+    def run():
+        session = database.SessionLocal()
+        try:
+            barrier.wait()
+            folded.append(analytics.refresh_summary(session, batch_size=50))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert sum(folded) == 2000
+    assert tuple(summary_totals(db)) == (2000, 20000.0)
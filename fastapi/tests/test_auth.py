@@ -0,0 +1,45 @@
+"""Account creation and login, on both session modes."""
+import pytest
+
+
+@pytest.fixture(params=["sync", "async"])
+def settings(request, settings):
+    return settings.model_copy(update={"db_mode": request.param})
+
+
+RENTER = {"username": "ana", "password": "pw", "first_name": "Ana", "last_name": "B", "email": "ana@example.com"}
+ADMIN = {"username": "root", "email": "root@example.com", "password": "pw"}
+
+
+def login(client, path, username, password):
+    return client.post(path, data={"username": username, "password": password})
+
+
+def test_renter_signup_and_login(client):
+    assert client.post("/auth/", json=RENTER).status_code == 201
+
+    r = login(client, "/auth/token", "ana", "pw")
+    assert r.status_code == 200
+    assert r.json()["token_type"] == "bearer"
+    assert login(client, "/auth/token", "ana", "wrong").status_code == 401
+
+
+def test_duplicate_renter_is_conflict(client):
+    assert client.post("/auth/", json=RENTER).status_code == 201
+
+    r = client.post("/auth/", json={**RENTER, "email": "other@example.com"})
+    assert r.status_code == 409
+    assert r.json()["detail"] == "Username already exists"
+
+    r = client.post("/auth/", json={**RENTER, "username": "other"})
+    assert r.status_code == 409
+    assert r.json()["detail"] == "Email already exists"
+
+
+def test_admin_signup_login_and_conflict(client):
+    assert client.post("/auth/admin", json=ADMIN).status_code == 201
+    assert login(client, "/auth/admin/token", "root", "pw").status_code == 200
+
+    r = client.post("/auth/admin", json={**ADMIN, "email": "other@example.com"})
+    assert r.status_code == 409
+    assert r.json()["detail"] == "Username already exists"
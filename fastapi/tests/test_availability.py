@@ -0,0 +1,213 @@
+"""AvailabilityIndex against a brute-force overlap scan, public API only."""
+from datetime import date, timedelta
+import random
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from api.availability import OPEN_END, AvailabilityIndex
+from api.database import Base
+from api.models import Rental, RentalStatusEnum
+
+D = date(2030, 1, 1)
+
+
+def day(n: int) -> date:
+    return D + timedelta(days=n)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def rental(rental_id, car_id, start, end, status=RentalStatusEnum.confirmed):
+    return Rental(id=rental_id, car_id=car_id, start_date=start, end_date=end, status=status)
+
+
+def loaded_index(db, rentals) -> AvailabilityIndex:
+    db.add_all(rentals)
+    db.commit()
+    index = AvailabilityIndex()
+    index.load(db)
+    return index
+
+
+def brute_busy(rentals, start, end) -> set:
+    return {
+        r.car_id
+        for r in rentals
+        if r.status in (RentalStatusEnum.pending, RentalStatusEnum.confirmed)
+        and r.start_date < end
+        and (r.end_date or OPEN_END) > start
+    }
+
+
+def brute_conflicts(rentals, car_id, start, end) -> set:
+    return {
+        r.id
+        for r in rentals
+        if r.car_id == car_id
+        and r.status in (RentalStatusEnum.pending, RentalStatusEnum.confirmed)
+        and r.start_date < end
+        and (r.end_date or OPEN_END) > start
+    }
+
+
+def assert_matches(index, rentals, windows, cars):
+    for start, end in windows:
+        busy = brute_busy(rentals, start, end)
+        assert index.busy_cars(start, end) == busy, (start, end)
+        for car_id in cars:
+            assert index.is_free(car_id, start, end) == (car_id not in busy), (car_id, start, end)
+            assert set(index.conflicts(car_id, start, end)) == brute_conflicts(rentals, car_id, start, end)
+
+
+# -------- BOUNDARIES --------
+
+def test_adjacent_intervals_do_not_overlap(db):
+    # [0, 5) puis [5, 10) : rendue le jour 5, la voiture repart le jour 5
+    index = loaded_index(db, [rental(1, 1, day(0), day(5))])
+    assert index.is_free(1, day(5), day(10))
+    assert index.is_free(1, day(-5), day(0))
+    assert not index.is_free(1, day(4), day(10))
+    assert not index.is_free(1, day(-5), day(1))
+
+
+def test_back_to_back_rentals_leave_no_gap(db):
+    index = loaded_index(db, [rental(1, 1, day(0), day(5)), rental(2, 1, day(5), day(10))])
+    assert index.conflicts(1, day(4), day(6)) == [1, 2]
+    assert index.conflicts(1, day(5), day(6)) == [2]
+    assert index.is_free(1, day(10), day(11))
+
+
+def test_zero_length_ranges(db):
+    rentals = [rental(1, 1, day(0), day(5)), rental(2, 2, day(3), day(3))]
+    index = loaded_index(db, rentals)
+    windows = [(day(n), day(n)) for n in range(-1, 7)] + [(day(2), day(4)), (day(3), day(4))]
+    assert_matches(index, rentals, windows, cars=(1, 2, 3))
+
+
+def test_open_ended_rental_blocks_forever(db):
+    index = loaded_index(db, [rental(1, 1, day(10), None)])
+    assert index.is_free(1, day(0), day(10))
+    assert not index.is_free(1, day(9), day(11))
+    assert not index.is_free(1, day(10_000), day(10_001))
+
+
+def test_non_blocking_statuses_are_ignored(db):
+    rentals = [
+        rental(1, 1, day(0), day(5), RentalStatusEnum.cancelled),
+        rental(2, 2, day(0), day(5), RentalStatusEnum.finished),
+        rental(3, 3, day(0), day(5), RentalStatusEnum.pending),
+    ]
+    index = loaded_index(db, rentals)
+    assert index.busy_cars(day(1), day(2)) == {3}
+
+
+# -------- UPDATES --------
+
+def test_remove_then_requery(db):
+    rentals = [rental(1, 1, day(0), day(5)), rental(2, 1, day(0), day(2))]
+    index = loaded_index(db, rentals)
+
+    index.remove_rental(1)
+    assert index.is_free(1, day(3), day(4))
+    assert not index.is_free(1, day(1), day(2))
+
+    index.remove_rental(2)
+    assert index.busy_cars(day(-10), day(10)) == set()
+
+    # Retirer deux fois, ou un id inconnu, ne change rien
+    index.remove_rental(2)
+    index.remove_rental(99)
+    assert index.is_free(1, day(0), day(5))
+
+
+def test_add_rental_replaces_and_drops_on_status_change(db):
+    index = loaded_index(db, [])
+    index.add_rental(rental(1, 1, day(0), day(5)))
+    assert not index.is_free(1, day(1), day(2))
+
+    # Même id, nouvelles dates : l'ancien intervalle disparaît
+    index.add_rental(rental(1, 1, day(10), day(12)))
+    assert index.is_free(1, day(1), day(2))
+    assert not index.is_free(1, day(11), day(12))
+
+    index.add_rental(rental(1, 1, day(10), day(12), RentalStatusEnum.cancelled))
+    assert index.busy_cars(day(-10), day(100)) == set()
+
+
+def test_updates_ignored_until_loaded():
+    index = AvailabilityIndex()
+    index.add_rental(rental(1, 1, day(0), day(5)))
+    assert index.is_free(1, day(0), day(5))
+
+
+def test_write_during_load_is_not_dropped(db):
+    index = AvailabilityIndex()
+    writer = threading.Thread(target=index.add_rental, args=(rental(2, 1, day(0), day(5)),))
+
+    # Réservation validée après la requête de chargement, avant sa fin
+    def book_during_load(conn, cursor, statement, *args):
+        if writer.ident is None:
+            writer.start()
+            writer.join(timeout=0.2)
+
+    engine = db.get_bind()
+    event.listen(engine, "after_cursor_execute", book_during_load)
+    try:
+        index.ensure_loaded(db)
+    finally:
+        event.remove(engine, "after_cursor_execute", book_during_load)
+    writer.join()
+
+    assert index.conflicts(1, day(1), day(2)) == [2]
+
+
+# -------- RANDOMIZED --------
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_random_against_brute_force(db, seed):
+    rng = random.Random(seed)
+    statuses = list(RentalStatusEnum)
+    rentals = []
+    for rental_id in range(1, 401):
+        start = day(rng.randrange(0, 120))
+        # Longueurs nulles, courtes, et quelques locations sans fin
+        end = None if rng.random() < 0.02 else start + timedelta(days=rng.choice([0, 1, 2, 5, 14]))
+        rentals.append(rental(rental_id, rng.randint(1, 15), start, end, rng.choice(statuses)))
+    index = loaded_index(db, rentals)
+
+    windows = []
+    for _ in range(60):
+        start = day(rng.randrange(-5, 130))
+        windows.append((start, start + timedelta(days=rng.choice([0, 1, 3, 7, 30]))))
+    cars = range(1, 17)
+    assert_matches(index, rentals, windows, cars)
+
+    # Retraits puis réinsertions, éventuellement déplacées
+    removed = rng.sample(rentals, 80)
+    for r in removed:
+        index.remove_rental(r.id)
+    remaining = [r for r in rentals if r not in removed]
+    assert_matches(index, remaining, windows, cars)
+
+    moved = []
+    for r in removed[:40]:
+        start = day(rng.randrange(0, 120))
+        moved.append(rental(r.id, r.car_id, start, start + timedelta(days=rng.randint(0, 6))))
+    for r in moved:
+        index.add_rental(r)
+    assert_matches(index, remaining + moved, windows, cars)
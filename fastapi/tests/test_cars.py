@@ -0,0 +1,36 @@
+"""Car writes: plate_number conflicts, on both session modes."""
+import pytest
+
+
+@pytest.fixture(params=["sync", "async"])
+def settings(request, settings):
+    return settings.model_copy(update={"db_mode": request.param})
+
+
+def car(plate: str) -> dict:
+    return {"plate_number": plate, "brand": "b", "model": "m", "rental_price_per_day": 30}
+
+
+def test_duplicate_plate_is_conflict(client):
+    assert client.post("/cars/", json=car("AA-1")).status_code == 201
+    second = client.post("/cars/", json=car("AA-2")).json()
+
+    assert client.post("/cars/", json=car("AA-1")).status_code == 409
+    r = client.put(f"/cars/{second['id']}", json={"plate_number": "AA-1"})
+    assert r.status_code == 409
+    assert r.json()["detail"] == "plate_number already exists"
+
+
+def test_failed_statements_leave_no_timing_state(client):
+    from api import database, metrics
+
+    assert client.post("/cars/", json=car("AA-1")).status_code == 201
+    for _ in range(20):
+        assert client.post("/cars/", json=car("AA-1")).status_code == 409
+
+    # Les INSERT en erreur ne sont pas comptés ; la lecture suivante, si
+    before = metrics.registry.queries_total
+    assert client.get("/cars/").status_code == 200
+    assert metrics.registry.queries_total > before
+    with database.engine.connect() as conn:
+        assert not conn.info.get("query_start")
@@ -0,0 +1,91 @@
+"""Rental lifecycle: confirmation, expiry, and car status transitions."""
+from datetime import date, timedelta
+
+from api import lifecycle
+from api.models import Car, CarStatusEnum, Rental, RentalStatusEnum, Renter
+
+TODAY = date(2030, 6, 15)
+
+
+def add_car(db, status=CarStatusEnum.available) -> Car:
+    car = Car(plate_number=f"LC-{db.query(Car).count()}", brand="b", model="m",
+              rental_price_per_day=30, status=status)
+    db.add(car)
+    db.commit()
+    return car
+
+
+def add_rental(db, car, start, end, status) -> Rental:
+    renter = Renter(first_name="first", last_name="last")
+    rental = Rental(car=car, renter=renter, start_date=start, end_date=end, status=status)
+    db.add(rental)
+    db.commit()
+    return rental
+
+
+def reload(db, row):
+    db.expire_all()
+    return db.get(type(row), row.id)
+
+
+def test_booking_confirmed_by_admin(client, db, admin_headers, renter_headers):
+    car = add_car(db)
+    booking = {"car_id": car.id, "start_date": "2030-07-01", "end_date": "2030-07-05"}
+    rental = client.post("/rentals/", json=booking, headers=renter_headers).json()
+    assert rental["status"] == "pending"
+
+    url = f"/rentals/{rental['id']}/confirm"
+    assert client.post(url, headers=renter_headers).status_code == 403
+
+    r = client.post(url, headers=admin_headers)
+    assert r.status_code == 200
+    assert r.json()["status"] == "confirmed"
+    assert client.post(url, headers=admin_headers).status_code == 409
+    assert client.post("/rentals/999/confirm", headers=admin_headers).status_code == 404
+
+
+def test_confirmed_rental_is_not_expired(client, db):
+    car = add_car(db)
+    pending = add_rental(db, car, TODAY - timedelta(days=5), TODAY + timedelta(days=1), RentalStatusEnum.pending)
+    confirmed = add_rental(db, add_car(db), TODAY - timedelta(days=5), TODAY + timedelta(days=1),
+                           RentalStatusEnum.confirmed)
+
+    assert lifecycle.expire_pending(db, TODAY) == 1
+    assert reload(db, pending).status == RentalStatusEnum.cancelled
+    assert reload(db, confirmed).status == RentalStatusEnum.confirmed
+
+
+def test_car_rented_then_released_when_rental_finishes(client, db):
+    car = add_car(db)
+    rental = add_rental(db, car, TODAY, TODAY + timedelta(days=3), RentalStatusEnum.confirmed)
+
+    assert lifecycle.sync_car_status(db, TODAY) == 1
+    assert reload(db, car).status == CarStatusEnum.rented
+
+    end = TODAY + timedelta(days=3)
+    assert lifecycle.finish_rentals(db, end) == 1
+    assert reload(db, rental).status == RentalStatusEnum.finished
+    assert reload(db, car).status == CarStatusEnum.available
+
+
+def test_admin_status_is_not_undone(client, db):
+    rented = add_car(db, CarStatusEnum.rented)
+    maintenance = add_car(db, CarStatusEnum.maintenance)
+    add_rental(db, maintenance, TODAY, TODAY + timedelta(days=3), RentalStatusEnum.confirmed)
+
+    lifecycle.sync_car_status(db, TODAY)
+    lifecycle.finish_rentals(db, TODAY)
+
+    assert reload(db, rented).status == CarStatusEnum.rented
+    assert reload(db, maintenance).status == CarStatusEnum.maintenance
+
+
+def test_release_waits_for_next_rental(client, db):
+    car = add_car(db)
+    first = add_rental(db, car, TODAY - timedelta(days=3), TODAY, RentalStatusEnum.confirmed)
+    add_rental(db, car, TODAY, TODAY + timedelta(days=2), RentalStatusEnum.confirmed)
+    lifecycle.sync_car_status(db, TODAY - timedelta(days=1))
+
+    assert lifecycle.finish_rentals(db, TODAY) == 1
+    assert reload(db, first).status == RentalStatusEnum.finished
+    assert reload(db, car).status == CarStatusEnum.rented
@@ -0,0 +1,27 @@
+"""Schema upgrade of existing databases at startup."""
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+
+from api import migrations
+from api.main import create_app
+
+
+def test_upgrade_adds_missing_columns_once(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE renters (id INTEGER PRIMARY KEY, first_name VARCHAR NOT NULL,"
+            " last_name VARCHAR NOT NULL, address VARCHAR, phone VARCHAR, email VARCHAR UNIQUE,"
+            " created_at DATETIME)"
+        )
+
+    applied = migrations.upgrade(engine)
+    assert any("username" in statement for statement in applied)
+    assert {"username", "hashed_password"} <= {c["name"] for c in inspect(engine).get_columns("renters")}
+    assert migrations.upgrade(engine) == []
+
+
+def test_startup_with_single_connection_pool(settings):
+    tuned = settings.model_copy(update={"db_pool_size": 1, "db_max_overflow": 0, "db_pool_timeout": 2})
+    with TestClient(create_app(tuned)) as client:
+        assert client.get("/").status_code == 200
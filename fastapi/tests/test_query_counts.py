@@ -0,0 +1,68 @@
+"""Nested read endpoints issue a fixed number of SQL statements, however
+many rows they return (no N+1 loading)."""
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from api import database
+from api.models import Car, Rental, RentalStatusEnum, Renter
+
+# (url, statements) ; avec un token admin, chaque route ajoute la
+# vérification de l'admin (1 requête)
+ENDPOINTS = [
+    ("/renters/?limit=200", 1 + 3),
+    ("/renters/1", 1 + 3),
+    ("/rentals/?limit=500", 1 + 1),
+    ("/rentals/1", 1 + 1),
+]
+
+
+def seed(renters: int, rentals_per_renter: int):
+    with database.engine.begin() as conn:
+        conn.execute(Renter.__table__.insert(), [
+            {"first_name": f"first-{i}", "last_name": f"last-{i}", "email": f"r{i}@example.com"}
+            for i in range(renters)
+        ])
+        conn.execute(Car.__table__.insert(), [
+            {"plate_number": f"QC-{i}", "brand": "b", "model": "m", "rental_price_per_day": 30}
+            for i in range(renters)
+        ])
+        conn.execute(Rental.__table__.insert(), [
+            {
+                "car_id": (renter_id + k) % renters + 1,
+                "renter_id": renter_id,
+                "start_date": date(2030, 1, 1) + timedelta(days=k * 10),
+                "end_date": date(2030, 1, 1) + timedelta(days=k * 10 + 3),
+                "status": RentalStatusEnum.confirmed,
+            }
+            for renter_id in range(1, renters + 1)
+            for k in range(rentals_per_renter)
+        ])
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+
+
+@pytest.mark.parametrize("renters,rentals_per_renter", [(3, 1), (150, 5)])
+@pytest.mark.parametrize("url,expected", ENDPOINTS)
+def test_statement_count(client, admin_headers, renters, rentals_per_renter, url, expected):
+    seed(renters, rentals_per_renter)
+
+    with count_statements() as statements:
+        r = client.get(url, headers=admin_headers)
+
+    assert r.status_code == 200, r.text
+    assert len(statements) == expected, statements
@@ -0,0 +1,89 @@
+"""Rental reads: a renter sees only their own rentals, an admin sees all."""
+from datetime import date
+
+import pytest
+
+from api.models import Car, Rental, RentalStatusEnum, Renter
+
+
+@pytest.fixture
+def two_renters(db):
+    alice = Renter(first_name="Alice", last_name="A", email="alice@example.com")
+    eve = Renter(first_name="Eve", last_name="E", email="eve@example.com")
+    car = Car(plate_number="RT-1", brand="b", model="m", rental_price_per_day=30)
+    db.add_all([alice, eve, car])
+    db.flush()
+    for renter, start in ((alice, date(2030, 1, 1)), (eve, date(2030, 2, 1))):
+        db.add(Rental(car_id=car.id, renter_id=renter.id, start_date=start,
+                      end_date=start.replace(day=5), status=RentalStatusEnum.confirmed))
+    db.commit()
+    return alice, eve
+
+
+def rental_of(db, renter) -> int:
+    return db.query(Rental.id).filter(Rental.renter_id == renter.id).scalar()
+
+
+def test_renter_lists_only_own_rentals(client, two_renters, token_headers):
+    alice, eve = two_renters
+    rows = client.get("/rentals/", headers=token_headers("eve", eve.id)).json()
+    assert [row["renter"]["email"] for row in rows] == ["eve@example.com"]
+
+
+def test_renter_cannot_read_other_rental(client, db, two_renters, token_headers):
+    alice, eve = two_renters
+    headers = token_headers("eve", eve.id)
+    assert client.get(f"/rentals/{rental_of(db, eve)}", headers=headers).status_code == 200
+    assert client.get(f"/rentals/{rental_of(db, alice)}", headers=headers).status_code == 404
+
+
+def test_admin_reads_every_rental(client, db, two_renters, admin_headers):
+    alice, eve = two_renters
+    assert len(client.get("/rentals/", headers=admin_headers).json()) == 2
+    assert client.get(f"/rentals/{rental_of(db, alice)}", headers=admin_headers).status_code == 200
+
+
+def test_forged_admin_role_is_forbidden(client, two_renters, token_headers):
+    assert client.get("/rentals/", headers=token_headers("mallory", 1, "admin")).status_code == 403
+
+
+def test_renter_history_is_limited_to_own_rentals(client, two_renters, token_headers):
+    alice, eve = two_renters
+    headers = token_headers("eve", eve.id)
+
+    for params in ({}, {"renter_id": alice.id}):
+        rows = client.get("/rentals/history", params=params, headers=headers).json()
+        assert {row["renter_id"] for row in rows} == {eve.id}
+
+
+def test_admin_history_filters(client, two_renters, admin_headers):
+    alice, eve = two_renters
+    assert len(client.get("/rentals/history", headers=admin_headers).json()) == 2
+    rows = client.get("/rentals/history", params={"renter_id": alice.id}, headers=admin_headers).json()
+    assert {row["renter_id"] for row in rows} == {alice.id}
+
+
+def booking(car_id: int, **extra) -> dict:
+    return {"car_id": car_id, "start_date": "2030-06-01", "end_date": "2030-06-03", **extra}
+
+
+def test_admin_books_for_named_renter(client, db, admin, two_renters, admin_headers):
+    alice, eve = two_renters
+    car_id = db.query(Car.id).scalar()
+
+    assert client.post("/rentals/", json=booking(car_id), headers=admin_headers).status_code == 400
+    assert client.post("/rentals/", json=booking(car_id, renter_id=999), headers=admin_headers).status_code == 404
+
+    r = client.post("/rentals/", json=booking(car_id, renter_id=eve.id), headers=admin_headers)
+    assert r.status_code == 201
+    assert r.json()["renter_id"] == eve.id
+    assert db.get(Rental, r.json()["id"]).admin_id == admin.id
+
+
+def test_renter_always_books_for_self(client, db, two_renters, token_headers):
+    alice, eve = two_renters
+    car_id = db.query(Car.id).scalar()
+
+    r = client.post("/rentals/", json=booking(car_id, renter_id=alice.id), headers=token_headers("eve", eve.id))
+    assert r.status_code == 201
+    assert r.json()["renter_id"] == eve.id
@@ -0,0 +1,31 @@
+"""Renter records are visible to admins, and to each renter for their own id."""
+from api.models import Renter
+
+
+def add_renter(db, email: str) -> Renter:
+    renter = Renter(first_name="first", last_name="last", email=email)
+    db.add(renter)
+    db.commit()
+    return renter
+
+
+def test_list_requires_admin(client, admin, renter_headers, admin_headers):
+    assert client.get("/renters/").status_code == 401
+    assert client.get("/renters/", headers=renter_headers).status_code == 403
+    assert client.get("/renters/", headers=admin_headers).status_code == 200
+
+
+def test_renter_reads_only_own_record(client, db, token_headers):
+    me = add_renter(db, "me@example.com")
+    other = add_renter(db, "other@example.com")
+    headers = token_headers("me", me.id)
+
+    assert client.get(f"/renters/{me.id}", headers=headers).status_code == 200
+    assert client.get(f"/renters/{other.id}", headers=headers).status_code == 403
+
+
+def test_admin_reads_any_record(client, db, admin_headers):
+    renter = add_renter(db, "someone@example.com")
+    r = client.get(f"/renters/{renter.id}", headers=admin_headers)
+    assert r.status_code == 200
+    assert r.json()["email"] == "someone@example.com"
@@ -0,0 +1,35 @@
+"""Accept-Encoding negotiation."""
+import pytest
+from starlette.requests import Request
+
+from api import serialization
+from api.serialization import accepted_encoding
+
+
+def request(accept_encoding: str) -> Request:
+    return Request({"type": "http", "headers": [(b"accept-encoding", accept_encoding.encode())]})
+
+
+@pytest.mark.parametrize("header", [
+    "gzip;q=0",
+    "gzip;q=0.0",
+    "gzip; q=0",
+    "gzip;q=0.000",
+    "gzip;Q=0",
+    "gzip;q=bogus",
+    "",
+    "identity",
+])
+def test_refused_or_absent(header):
+    assert accepted_encoding(request(header)) is None
+
+
+@pytest.mark.parametrize("header", ["gzip", "gzip;q=0.5", "GZIP ; q=1", "deflate, gzip;q=0.001"])
+def test_gzip_accepted(header):
+    assert accepted_encoding(request(header)) == "gzip"
+
+
+def test_br_refused_falls_back_to_gzip(monkeypatch):
+    monkeypatch.setattr(serialization, "brotli", object())
+    assert accepted_encoding(request("br;q=0.0, gzip")) == "gzip"
+    assert accepted_encoding(request("br; q=0.8, gzip")) == "br"
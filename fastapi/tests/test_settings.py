@@ -0,0 +1,48 @@
+"""Tunables come from Settings and reach the shared objects via create_app()."""
+from api import deps, lifecycle, ratelimit, write_queue
+from api.events import fleet_events
+from api.main import create_app
+from api.response_cache import cars_cache
+from api.settings import Settings
+
+
+def test_from_env_reads_tunables():
+    settings = Settings.from_env({
+        "AUTH_TOKEN_CACHE_SIZE": "7",
+        "GROUP_COMMIT": "1",
+        "SLOW_QUERY_MS": "2.5",
+        "LIFECYCLE_CARS_INTERVAL": "5",
+    })
+    assert settings.auth_token_cache_size == 7
+    assert settings.group_commit is True
+    assert settings.slow_query_ms == 2.5
+    assert settings.lifecycle_cars_interval == 5
+
+
+def test_create_app_applies_settings(settings):
+    tuned = settings.model_copy(update={
+        "auth_token_cache_size": 3,
+        "auth_hash_workers": 2,
+        "auth_rate_ip_burst": 99,
+        "auth_max_inflight_verifications": 11,
+        "response_cache_size": 4,
+        "fleet_events_queue_size": 5,
+        "group_commit_max_batch": 6,
+        "lifecycle_batch_size": 7,
+        "lifecycle_cars_interval": 8,
+    })
+    create_app(tuned)
+
+    assert deps.token_cache.maxsize == 3
+    assert deps.hash_workers == 2
+    assert ratelimit.ip_buckets.capacity == 99
+    assert ratelimit.verification_slots.limit == 11
+    assert cars_cache.maxsize == 4
+    assert fleet_events.queue_size == 5
+    assert write_queue.writer.max_batch == 6
+    assert lifecycle.scheduler.batch_size == 7
+    assert {job.name: job.interval for job in lifecycle.scheduler.jobs}["sync_car_status"] == 8
+
+    # Retour aux réglages par défaut pour les tests suivants
+    create_app(settings)
+    assert cars_cache.maxsize == settings.response_cache_size